@@ -0,0 +1,90 @@
+"""Synthetic Research Templates and Research Surveys for the benchmarks."""
+
+import random
+
+import frappe
+
+TEMPLATE = "Benchmark Template"
+
+
+def make_template(indicators=20, dimensions=4, name=TEMPLATE):
+	"""
+	Insert a Research Template with `indicators` spread evenly over `dimensions`
+
+	Returns:
+		list: (indicator, dimension) of every template indicator, in template order
+	"""
+	dimension_names = [f"Dimension {i + 1}" for i in range(dimensions)]
+	weightage = round(100 / dimensions, 2)
+
+	frappe.db.sql(
+		"INSERT INTO `tabResearch Template` (name, project_title, creation, modified) VALUES (%s, %s, %s, %s)",
+		(name, name, "2025-01-01 00:00:00", "2025-01-01 00:00:00"),
+	)
+	frappe.db.bulk_insert(
+		"Dimensions",
+		["name", "parent", "parenttype", "parentfield", "idx", "dimensions", "weightage"],
+		[
+			(f"{name}-dimension-{i}", name, "Research Template", "table_gohs", i + 1, dimension, weightage)
+			for i, dimension in enumerate(dimension_names)
+		],
+	)
+
+	# Mix space separated and snake_case names, the report camel cases both into column keys
+	template_indicators = [
+		(f"Indicator {i + 1}" if i % 2 else f"indicator_{i + 1}", dimension_names[i % dimensions])
+		for i in range(indicators)
+	]
+	frappe.db.bulk_insert(
+		"Indicators",
+		["name", "parent", "parenttype", "parentfield", "idx", "indicators", "dimension", "weight_dimension"],
+		[
+			(f"{name}-indicator-{i}", name, "Research Template", "table_zuog", i + 1, indicator, dimension, weightage)
+			for i, (indicator, dimension) in enumerate(template_indicators)
+		],
+	)
+	return template_indicators
+
+
+def make_surveys(template_indicators, responses, name=TEMPLATE, skip_rate=0.05, seed=42):
+	"""
+	Insert `responses` Research Surveys answering the template indicators
+
+	Every survey skips an indicator with probability `skip_rate`, so not
+	all of them have a value for every column.
+
+	Returns:
+		int: Number of Data Entry Table rows inserted
+	"""
+	rng = random.Random(seed)
+	surveys, entries = [], []
+	for survey in range(responses):
+		survey_name = f"{name}-survey-{survey + 1:07d}"
+		month = survey % 12 + 1
+		created = f"2025-{month:02d}-{survey % 28 + 1:02d} 10:00:00"
+		surveys.append((survey_name, name, created, created))
+
+		for idx, (indicator, dimension) in enumerate(template_indicators, 1):
+			if rng.random() < skip_rate:
+				continue
+			entries.append(
+				(
+					f"{survey_name}-{idx}",
+					survey_name,
+					"Research Survey",
+					"table_bgyj",
+					idx,
+					indicator,
+					dimension,
+					float(rng.randint(0, 3)),
+					float(rng.randint(0, 3)),
+				)
+			)
+
+	frappe.db.bulk_insert("Research Survey", ["name", "project_title", "creation", "modified"], surveys)
+	frappe.db.bulk_insert(
+		"Data Entry Table",
+		["name", "parent", "parenttype", "parentfield", "idx", "indicator", "dimension", "variable1", "variable2"],
+		entries,
+	)
+	return len(entries)
@@ -0,0 +1,198 @@
+"""
+Latency, throughput and memory curves of the report and export paths
+
+Runs the real report code against the SQLite stand-in for `frappe` on
+synthetic data, for a growing number of Data Entry Table rows:
+
+	python -m benchmarks.run                        # 10^3 .. 10^5 child rows
+	python -m benchmarks.run --max-rows 1000000     # up to 10^6
+	python -m benchmarks.run --save                 # record the results as the new baselines
+	python -m benchmarks.run --check                # exit 1 when a result regressed past the tolerance
+	                                                # and by more than --min-delta-ms (10 ms)
+
+Latency is the median of `--repeat` runs, peak memory comes from a separate
+traced run so tracemalloc does not slow down the timed ones.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks import stand_in
+
+frappe = stand_in.install()
+
+from benchmarks.generate import TEMPLATE, make_surveys, make_template  # noqa: E402
+from gisappv1.gisappv1.doctype.survey_indicator_rollup.survey_indicator_rollup import (  # noqa: E402
+	rebuild_rollups,
+)
+from gisappv1.gisappv1.report.ground_water_report import ground_water_report  # noqa: E402
+from gisappv1.gisappv1.report.survey_report import (  # noqa: E402
+	survey_report,
+	survey_report_cache,
+	survey_report_download,
+)
+from gisappv1.indexes import add_report_indexes  # noqa: E402
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+FILTERS = {"project_title": TEMPLATE, "dimension": "All Indicators"}
+
+
+def clear_caches():
+	frappe.cache().store.clear()
+	survey_report_cache.local_cache.entries.clear()
+
+
+def survey_report_execute():
+	# Measure the computation, not a cache hit
+	clear_caches()
+	return survey_report.execute(dict(FILTERS))[1]
+
+
+def ground_water_get_data():
+	return ground_water_report.get_data({})
+
+
+def export_html():
+	# execute is served from the cache here, what is left is building the HTML, never the reused PDF.
+	# The stand-in renders no real PDF pages to merge, so the table stays a single document.
+	frappe.conf.report_pdf_chunk_rows = 10**9
+	survey_report.execute(dict(FILTERS))
+	frappe.db.delete("Survey Report Export")
+	return survey_report.export_to_pdf(dict(FILTERS), "Benchmark Report")
+
+
+def download_csv():
+	# The pivot goes through a temporary file, peak memory should not follow the row count
+	response = survey_report_download.download_csv(dict(FILTERS))
+	for _block in response.response:
+		pass
+	response.response.close()
+
+
+BENCHMARKS = {
+	"survey_report.execute": survey_report_execute,
+	"ground_water_report.get_data": ground_water_get_data,
+	"survey_report.export_to_pdf": export_html,
+	"survey_report.download_csv": download_csv,
+}
+
+
+def load_data(rows, indicators, dimensions):
+	"""Fresh database holding `rows` Data Entry Table rows, about rows / indicators surveys."""
+	frappe.db = stand_in.Database()
+	add_report_indexes()
+	clear_caches()
+	template_indicators = make_template(indicators, dimensions)
+	entries = make_surveys(template_indicators, max(rows // indicators, 1))
+	rebuild_rollups()
+	return entries
+
+
+def measure(benchmark, repeat):
+	latencies, queries = [], 0
+	for _ in range(repeat):
+		before = frappe.db.query_count
+		start = time.perf_counter()
+		benchmark()
+		latencies.append((time.perf_counter() - start) * 1000)
+		queries = frappe.db.query_count - before
+
+	tracemalloc.start()
+	benchmark()
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	return {
+		"latency_ms": round(statistics.median(latencies), 3),
+		"peak_memory_kb": round(peak / 1024, 1),
+		"queries": queries,
+	}
+
+
+def compare(name, rows, result, baselines, tolerance, min_delta_ms=0):
+	baseline = baselines.get(name, {}).get(str(rows))
+	if not baseline:
+		return "", False
+
+	change = result["latency_ms"] / baseline["latency_ms"] - 1 if baseline["latency_ms"] else 0
+	# A few milliseconds either way is scheduler noise, however large the relative change
+	regressed = change > tolerance and result["latency_ms"] - baseline["latency_ms"] > min_delta_ms
+	return f"{change:+7.1%}{' REGRESSION' if regressed else ''}", regressed
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--max-rows", type=int, default=100_000, help="largest number of child rows")
+	parser.add_argument("--indicators", type=int, default=20, help="indicators per template")
+	parser.add_argument("--dimensions", type=int, default=4, help="dimensions per template")
+	parser.add_argument("--repeat", type=int, default=3, help="timed runs per size")
+	parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+	parser.add_argument("--save", action="store_true", help="write the results to baselines.json")
+	parser.add_argument("--check", action="store_true", help="exit 1 when a benchmark regressed")
+	parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before --check fails")
+	parser.add_argument(
+		"--min-delta-ms", type=float, default=10, help="slowdowns smaller than this many ms never fail --check"
+	)
+	args = parser.parse_args(argv)
+
+	baselines = {}
+	if os.path.exists(BASELINES):
+		with open(BASELINES) as f:
+			baselines = json.load(f).get("results", {})
+
+	names = args.only or list(BENCHMARKS)
+	results = {name: {} for name in names}
+	regressions = []
+
+	print(f"{'benchmark':<30} {'rows':>9} {'latency ms':>11} {'rows/s':>12} {'peak MB':>9} {'queries':>8}  vs baseline")
+	for size in [size for size in SIZES if size <= args.max_rows]:
+		rows = load_data(size, args.indicators, args.dimensions)
+		for name in names:
+			result = measure(BENCHMARKS[name], args.repeat)
+			result["rows"] = rows
+			results[name][str(size)] = result
+
+			delta, regressed = compare(name, size, result, baselines, args.tolerance, args.min_delta_ms)
+			if regressed:
+				regressions.append((name, size))
+			throughput = rows / result["latency_ms"] * 1000 if result["latency_ms"] else 0
+			print(
+				f"{name:<30} {rows:>9} {result['latency_ms']:>11.1f} {throughput:>12.0f} "
+				f"{result['peak_memory_kb'] / 1024:>9.1f} {result['queries']:>8}  {delta}"
+			)
+
+	if args.save:
+		for name, sizes in results.items():
+			baselines.setdefault(name, {}).update(sizes)
+		with open(BASELINES, "w") as f:
+			json.dump(
+				{
+					"environment": {
+						"python": platform.python_version(),
+						"machine": platform.machine(),
+						"indicators": args.indicators,
+						"dimensions": args.dimensions,
+					},
+					"results": baselines,
+				},
+				f,
+				indent=1,
+				sort_keys=True,
+			)
+			f.write("\n")
+
+	if args.check and regressions:
+		print("Regressed: " + ", ".join(f"{name} @ {rows}" for name, rows in regressions))
+		return 1
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
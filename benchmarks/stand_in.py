@@ -0,0 +1,340 @@
+"""
+SQLite backed stand-in for the parts of `frappe` the reports use
+
+Installed into `sys.modules` before any report module is imported, so the
+benchmarks run the real report code without a bench or a live site. Only
+what the benchmarked paths touch is implemented.
+"""
+
+import datetime
+import hashlib
+import html
+import re
+import sqlite3
+import sys
+import types
+import uuid
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE `tabResearch Template` (
+	name TEXT PRIMARY KEY, project_title TEXT, creation TEXT, modified TEXT
+);
+CREATE TABLE `tabDimensions` (
+	name TEXT PRIMARY KEY, parent TEXT, parenttype TEXT, parentfield TEXT, idx INTEGER,
+	dimensions TEXT, weightage REAL
+);
+CREATE TABLE `tabIndicators` (
+	name TEXT PRIMARY KEY, parent TEXT, parenttype TEXT, parentfield TEXT, idx INTEGER,
+	indicators TEXT, dimension TEXT, weight_dimension REAL
+);
+CREATE TABLE `tabResearch Survey` (
+	name TEXT PRIMARY KEY, project_title TEXT, creation TEXT, modified TEXT, docstatus INTEGER DEFAULT 0
+);
+CREATE TABLE `tabData Entry Table` (
+	name TEXT PRIMARY KEY, parent TEXT, parenttype TEXT, parentfield TEXT, idx INTEGER,
+	indicator TEXT, dimension TEXT, variable1 REAL, variable2 REAL
+);
+CREATE TABLE `tabSurvey Indicator Rollup` (
+	name TEXT PRIMARY KEY, creation TEXT, modified TEXT, owner TEXT, modified_by TEXT,
+	scope TEXT, research_template TEXT, dimension TEXT, indicator TEXT,
+	sum_variable1 REAL, sum_variable2 REAL, entry_count INTEGER, survey_count INTEGER
+);
+CREATE TABLE `tabSurvey Indicator Trend` (
+	name TEXT PRIMARY KEY, creation TEXT, modified TEXT, owner TEXT, modified_by TEXT,
+	scope TEXT, research_template TEXT, dimension TEXT, indicator TEXT, period TEXT,
+	sum_variable1 REAL, sum_variable2 REAL, entry_count INTEGER, survey_count INTEGER
+);
+CREATE TABLE `tabSurvey Report Export` (
+	name TEXT PRIMARY KEY, creation TEXT, file TEXT, research_template TEXT,
+	file_size INTEGER, export_scope TEXT, export_key TEXT
+);
+CREATE INDEX `parent_index_indicators` ON `tabIndicators` (parent);
+CREATE INDEX `parent_index_dimensions` ON `tabDimensions` (parent);
+CREATE INDEX `parent_index_entries` ON `tabData Entry Table` (parent);
+CREATE INDEX `research_template_index` ON `tabSurvey Indicator Rollup` (research_template);
+"""
+
+
+class _dict(dict):
+	__getattr__ = dict.get
+
+	def __setattr__(self, key, value):
+		self[key] = value
+
+
+class Database:
+	"""`frappe.db` on an in-memory SQLite database, counting every statement it runs."""
+
+	def __init__(self):
+		self.conn = sqlite3.connect(":memory:")
+		self.conn.executescript(SCHEMA)
+		self.query_count = 0
+		# Statements run in autocommit, so there is no commit to wait for
+		self.after_commit = types.SimpleNamespace(add=lambda callback: callback())
+
+	def sql(self, query, values=(), as_dict=False, as_list=False, as_iterator=False, **kwargs):
+		query, values = self.to_sqlite(query, values)
+		self.query_count += 1
+		cursor = self.conn.execute(query, values)
+		if cursor.description is None:
+			return ()
+		if as_iterator and not as_dict:
+			# SQLite cursors already step through the result, like an unbuffered MariaDB cursor
+			return iter(cursor)
+
+		rows = cursor.fetchall()
+		if as_dict:
+			fields = [column[0] for column in cursor.description]
+			return [_dict(zip(fields, row)) for row in rows]
+		if as_list:
+			return [list(row) for row in rows]
+		return tuple(rows)
+
+	def to_sqlite(self, query, values):
+		"""Rewrite MariaDB style `%s` / `%(name)s` placeholders, expanding tuples for `IN`."""
+		if values is None:
+			values = ()
+		if isinstance(values, dict):
+			params = {}
+
+			def named(match):
+				value = values[match.group(1)]
+				if isinstance(value, (list, tuple)):
+					keys = [f"{match.group(1)}_{i}" for i in range(len(value))]
+					params.update(zip(keys, value))
+					return "(" + ", ".join(":" + key for key in keys) + ")"
+				params[match.group(1)] = value
+				return ":" + match.group(1)
+
+			return re.sub(r"%\((\w+)\)s", named, query), params
+
+		if not isinstance(values, (list, tuple)):
+			values = (values,)
+		params = []
+		iterator = iter(values)
+
+		def positional(match):
+			value = next(iterator)
+			if isinstance(value, (list, tuple)):
+				params.extend(value)
+				return "(" + ", ".join("?" * len(value)) + ")"
+			params.append(value)
+			return "?"
+
+		return re.sub(r"%s", positional, query), params
+
+	@contextmanager
+	def unbuffered_cursor(self):
+		yield
+
+	def sql_list(self, query, values=(), **kwargs):
+		return [row[0] for row in self.sql(query, values)]
+
+	def exists(self, doctype, name=None):
+		rows = self.sql(f"SELECT name FROM `tab{doctype}` WHERE name = %s", name)
+		return rows[0][0] if rows else None
+
+	def get_value(self, doctype, name, fieldname):
+		where, values = build_conditions(name if isinstance(name, dict) else {"name": name})
+		rows = self.sql(f"SELECT `{fieldname}` FROM `tab{doctype}`{where}", values)
+		return rows[0][0] if rows else None
+
+	def add_index(self, doctype, fields, index_name=None):
+		index_name = index_name or "_".join(fields) + "_index"
+		self.sql(f"CREATE INDEX IF NOT EXISTS `{index_name}` ON `tab{doctype}` ({', '.join(fields)})")
+
+	def delete(self, doctype, filters=None):
+		where, values = build_conditions(filters)
+		self.sql(f"DELETE FROM `tab{doctype}`{where}", values)
+
+	def bulk_insert(self, doctype, fields, values, ignore_duplicates=False, chunk_size=10000):
+		self.query_count += 1
+		verb = "INSERT OR IGNORE" if ignore_duplicates else "INSERT"
+		placeholders = ", ".join("?" * len(fields))
+		self.conn.executemany(
+			f"{verb} INTO `tab{doctype}` ({', '.join(fields)}) VALUES ({placeholders})", values
+		)
+
+
+def build_conditions(filters):
+	if not filters:
+		return "", []
+
+	conditions, values = [], []
+	for fieldname, value in filters.items():
+		if isinstance(value, (list, tuple)):
+			operator, value = value
+			if operator.lower() in ("in", "not in"):
+				conditions.append(f"`{fieldname}` {operator} %s")
+				values.append(tuple(value))
+				continue
+			conditions.append(f"`{fieldname}` {operator} %s")
+		else:
+			conditions.append(f"`{fieldname}` = %s")
+		values.append(value)
+	return " WHERE " + " AND ".join(conditions), values
+
+
+class Cache:
+	"""Process local dict with the subset of the RedisWrapper API the app calls."""
+
+	def __init__(self):
+		self.store = {}
+
+	def make_key(self, key, *args, **kwargs):
+		return key
+
+	def get_value(self, key, *args, **kwargs):
+		return self.store.get(key)
+
+	def set_value(self, key, value, *args, **kwargs):
+		self.store[key] = value
+
+	def delete_value(self, keys, *args, **kwargs):
+		keys = {keys} if isinstance(keys, str) else set(keys)
+		# Hashes are stored under (name, key), deleting the name drops the whole hash like in Redis
+		for key in [key for key in self.store if key in keys or (isinstance(key, tuple) and key[0] in keys)]:
+			self.store.pop(key)
+
+	def get(self, key):
+		return self.store.get(key)
+
+	def incrby(self, key, amount=1):
+		self.store[key] = self.store.get(key, 0) + amount
+		return self.store[key]
+
+	def hget(self, name, key, *args, **kwargs):
+		return self.store.get((name, key))
+
+	def hset(self, name, key, value, *args, **kwargs):
+		self.store[(name, key)] = value
+
+	def hdel(self, name, key, *args, **kwargs):
+		self.store.pop((name, key), None)
+
+
+class File(_dict):
+	def insert(self, ignore_permissions=False):
+		self.name = hashlib.sha1(self.content).hexdigest()[:10]
+		return self
+
+
+class Document(_dict):
+	"""New document saved as a row of its table."""
+
+	def insert(self, ignore_permissions=False):
+		self.name = uuid.uuid4().hex[:10]
+		self.creation = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+		fields = [field for field in self if field != "doctype"]
+		sys.modules["frappe"].db.sql(
+			"INSERT INTO `tab{0}` ({1}) VALUES ({2})".format(
+				self.doctype, ", ".join(f"`{field}`" for field in fields), ", ".join(["%s"] * len(fields))
+			),
+			[self[field] for field in fields],
+		)
+		return self
+
+
+def install():
+	"""Register the stand-in as `frappe` and return it, a no-op when it is already installed."""
+	if getattr(sys.modules.get("frappe"), "is_stand_in", False):
+		return sys.modules["frappe"]
+
+	frappe = types.ModuleType("frappe")
+	frappe.is_stand_in = True
+	frappe._dict = _dict
+	frappe.db = Database()
+	frappe.conf = _dict()
+	frappe.local = types.SimpleNamespace(site="benchmark", conf=frappe.conf, report_profile=None)
+	frappe.flags = _dict()
+	frappe.session = _dict(user="Administrator")
+	frappe._ = lambda message, *args, **kwargs: message
+	frappe.whitelist = lambda *args, **kwargs: args[0] if args and callable(args[0]) else (lambda fn: fn)
+	frappe.only_for = lambda *args, **kwargs: None
+	frappe.has_permission = lambda *args, **kwargs: True
+	frappe.log_error = lambda *args, **kwargs: None
+	frappe.scrub = lambda text: text.replace(" ", "_").replace("-", "_").lower()
+	frappe.generate_hash = lambda *args, length=10, **kwargs: uuid.uuid4().hex[:length]
+
+	cache = Cache()
+	frappe.cache = lambda: cache
+
+	def get_all(doctype, filters=None, fields=None, order_by=None, **kwargs):
+		where, values = build_conditions(filters)
+		columns = ", ".join(f"`{field}`" for field in fields or ["name"])
+		order = f" ORDER BY {order_by}" if order_by else ""
+		return frappe.db.sql(f"SELECT {columns} FROM `tab{doctype}`{where}{order}", values, as_dict=True)
+
+	def get_doc(values, name=None):
+		if isinstance(values, dict) and values.get("doctype") == "File":
+			return File(values)
+		if isinstance(values, dict) and values.get("doctype") == "Survey Report Export":
+			return Document(values)
+		raise NotImplementedError(f"get_doc is not available in the benchmark stand-in: {values}")
+
+	frappe.get_all = get_all
+	frappe.get_list = get_all
+	frappe.get_doc = get_doc
+
+	utils = types.ModuleType("frappe.utils")
+	utils.cint = cint
+	utils.flt = flt
+	utils.cstr = lambda value: "" if value is None else str(value)
+	utils.now = lambda: datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+	utils.now_datetime = datetime.datetime.now
+	utils.getdate = getdate
+	utils.add_days = lambda date, days: date + datetime.timedelta(days=days)
+	utils.add_to_date = lambda date, days=0, minutes=0, **kwargs: date + datetime.timedelta(days=days, minutes=minutes)
+	utils.get_datetime = lambda value=None: datetime.datetime.fromisoformat(str(value)) if value else datetime.datetime.now()
+	utils.escape_html = lambda value: html.escape(str(value))
+	utils.get_site_path = lambda *path: "/".join(("benchmark",) + path)
+	utils.get_files_path = lambda *path, is_private=False: "/".join(("benchmark", "files") + path)
+
+	pdf = types.ModuleType("frappe.utils.pdf")
+	# Rendering is wkhtmltopdf's cost, the benchmark only measures building the HTML
+	pdf.get_pdf = lambda html_content, options=None: html_content.encode()
+	utils.pdf = pdf
+
+	model = types.ModuleType("frappe.model")
+	document = types.ModuleType("frappe.model.document")
+	document.Document = type("Document", (), {})
+	model.document = document
+
+	frappe.utils = utils
+	frappe.model = model
+	sys.modules.update(
+		{
+			"frappe": frappe,
+			"frappe.utils": utils,
+			"frappe.utils.pdf": pdf,
+			"frappe.model": model,
+			"frappe.model.document": document,
+		}
+	)
+	return frappe
+
+
+def getdate(value=None):
+	if value is None:
+		return datetime.date.today()
+	if isinstance(value, datetime.datetime):
+		return value.date()
+	if isinstance(value, datetime.date):
+		return value
+	return datetime.date.fromisoformat(str(value)[:10])
+
+
+def cint(value):
+	try:
+		return int(float(value or 0))
+	except (TypeError, ValueError):
+		return 0
+
+
+def flt(value, precision=None):
+	try:
+		value = float(value or 0)
+	except (TypeError, ValueError):
+		value = 0.0
+	return round(value, precision) if precision is not None else value
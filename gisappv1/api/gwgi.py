@@ -0,0 +1,120 @@
+import json
+
+import frappe
+from frappe.utils import cint
+
+from gisappv1.gisappv1.doctype.research_template.template_metadata import (
+    get_all_template_indicators,
+    get_template_indicators,
+    get_template_meta,
+)
+from gisappv1.gisappv1.doctype.survey_indicator_rollup.survey_indicator_rollup import (
+    get_all_indicator_totals,
+    get_trend_totals,
+)
+from gisappv1.gisappv1.report.survey_report.survey_matrix import SurveySummary
+
+
+@frappe.whitelist()
+def get_gwgi_overview(research_templates=None, limit=None):
+    """
+    GWGI and dimension averages of every Research Template, ranked by GWGI
+
+    Computed from the Survey Indicator Rollups and the template indicators,
+    two queries in total however many templates there are. The values are
+    the ones the Survey Report GWGI chart shows for "All Indicators".
+
+    Args:
+        research_templates (list): Only these templates (a JSON list is accepted), every readable one when empty
+        limit (int): Only return the best ranked templates
+
+    Returns:
+        dict: {"dimensions": [...], "columns": [...], "data": [[rank, template, surveys, gwgi, *dimension averages]]}
+            Dimension averages follow `dimensions`, None where the template has no such dimension.
+    """
+    frappe.has_permission("Research Template", "read", throw=True)
+
+    if isinstance(research_templates, str):
+        research_templates = json.loads(research_templates)
+
+    # The aggregates are raw SQL, so user permissions are applied to the template list first
+    readable = frappe.get_list("Research Template", pluck="name", limit_page_length=0)
+    if research_templates:
+        readable = set(readable)
+        research_templates = [template for template in research_templates if template in readable]
+    else:
+        research_templates = readable
+
+    template_indicators = get_all_template_indicators(research_templates)
+    template_totals = get_all_indicator_totals(list(template_indicators))
+
+    dimensions, scores = [], []
+    for template, indicators_list in template_indicators.items():
+        survey_count, indicator_totals = template_totals.get(template, (0, []))
+        summary = SurveySummary.from_indicator_totals(indicator_totals, survey_count, indicators_list)
+        dimension_names, _weights, dimension_averages, gwgi_value = summary.gwgi(indicators_list)
+
+        for dimension in dimension_names:
+            if dimension not in dimensions:
+                dimensions.append(dimension)
+
+        scores.append(
+            (
+                template,
+                survey_count,
+                gwgi_value if survey_count else None,
+                dict(zip(dimension_names, dimension_averages.tolist())) if survey_count else {},
+            )
+        )
+
+    # Templates without surveys have no score, they go last
+    scores.sort(key=lambda score: (score[2] is None, -(score[2] or 0), score[0]))
+    if cint(limit):
+        scores = scores[: cint(limit)]
+
+    return {
+        "dimensions": dimensions,
+        "columns": ["rank", "research_template", "survey_count", "gwgi"] + dimensions,
+        "data": [
+            [rank, template, survey_count, gwgi_value]
+            + [dimension_averages.get(dimension) for dimension in dimensions]
+            for rank, (template, survey_count, gwgi_value, dimension_averages) in enumerate(scores, 1)
+        ],
+    }
+
+
+@frappe.whitelist()
+def get_gwgi_trend(research_template, from_date=None, to_date=None):
+    """
+    Month by month GWGI and dimension averages of a Research Template
+
+    Read from the Survey Indicator Trends, so the raw responses are never
+    scanned. Every month covers the surveys created in it.
+
+    Args:
+        research_template (str): Name of the Research Template
+        from_date (str): Only months from this date on
+        to_date (str): Only months up to this date
+
+    Returns:
+        dict: {"dimensions": [...], "columns": [...], "data": [[period, surveys, gwgi, *dimension averages]]}
+            in chronological order
+    """
+    frappe.has_permission("Research Template", "read", research_template, throw=True)
+
+    indicators_list = get_template_indicators(get_template_meta(research_template))
+
+    dimensions, data = [], []
+    for period, (survey_count, indicator_totals) in get_trend_totals(research_template, from_date, to_date).items():
+        summary = SurveySummary.from_indicator_totals(indicator_totals, survey_count, indicators_list)
+        dimension_names, _weights, dimension_averages, gwgi_value = summary.gwgi(indicators_list)
+        dimensions = dimensions or list(dimension_names)
+
+        averages = dict(zip(dimension_names, dimension_averages.tolist()))
+        data.append([period, survey_count, gwgi_value] + [averages.get(dimension) for dimension in dimensions])
+
+    return {
+        "dimensions": dimensions,
+        "columns": ["period", "survey_count", "gwgi"] + dimensions,
+        "data": data,
+    }
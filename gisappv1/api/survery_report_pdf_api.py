@@ -1,5 +1,7 @@
 import frappe
 
+from gisappv1 import report_pdf
+
 @frappe.whitelist()
 def export_to_pdf(filters, report_name, chart_image=None, html_data=None):
     """
@@ -15,118 +17,35 @@ def export_to_pdf(filters, report_name, chart_image=None, html_data=None):
         str: Name of the generated PDF file
     """
     try:
-        import base64
-        from datetime import datetime
-        from frappe.utils.pdf import get_pdf
-        from frappe.utils import get_site_path, get_files_path
+        from gisappv1.gisappv1.report.survey_report.survey_report import execute
+        from gisappv1.gisappv1.report.survey_report.survey_report_background import computed_in_place
+        from gisappv1.gisappv1.report.survey_report.survey_report_chart import get_chart_svgs
         
         # Convert filters from string to dict if needed
         if isinstance(filters, str):
             import json
             filters = json.loads(filters)
         
-        # Re-run the report to get the data
-        columns, data = execute(filters)[:2]
-        
-        # Generate HTML for the PDF
-        html_content = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>{0}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-                .report-header {{ text-align: center; margin-bottom: 20px; }}
-                .report-title {{ font-size: 18px; font-weight: bold; }}
-                .report-date {{ font-size: 12px; color: #666; }}
-                .chart-container {{ text-align: center; margin: 20px 0; }}
-                .chart-container img {{ max-width: 100%; height: auto; }}
-                .table-container {{ overflow: visible; width: 100%; }}
-                table {{ width: 100%; border-collapse: collapse; margin-top: 20px; page-break-inside: auto; }}
-                thead {{ display: table-header-group; }}
-                tr {{ page-break-inside: avoid; page-break-after: auto; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; font-size: 10px; }}
-                th {{ background-color: #f2f2f2; font-weight: bold; }}
-                tr:nth-child(even) {{ background-color: #f9f9f9; }}
-                @page {{ size: landscape; margin: 1cm; }}
-            </style>
-        </head>
-        <body>
-            <div class="report-header">
-                <div class="report-title">{0}</div>
-                <div class="report-date">Generated on: {1}</div>
-            </div>
-        """.format(report_name, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        
-        # Add chart image if provided
-        if chart_image:
-            # Remove the data:image/png;base64, prefix if present
-            if "base64," in chart_image:
-                chart_image = chart_image.split("base64,")[1]
-            
-            html_content += """
-            <div class="chart-container">
-                <h3>Radar Chart Visualization</h3>
-                <img src="data:image/png;base64,{0}" alt="Survey Chart">
-            </div>
-            """.format(chart_image)
-        
-        # Generate table with scrollable container
-        html_content += '<h3>Detailed Data</h3><div class="table-container"><table><thead><tr>'
-        
-        # Add table headers - only include essential columns to fit in PDF
-        visible_columns = []
-        for col in columns:
-            # Skip columns that start with 'parent' to reduce table width
-            if not col.get("fieldname", "").startswith("parent"):
-                visible_columns.append(col)
-                html_content += "<th>{0}</th>".format(col.get("label", ""))
+        # Re-run the report to get the data, heavy templates too instead of their pending placeholder
+        with computed_in_place():
+            result = execute(filters)
+        columns, data = result[:2]
         
-        html_content += "</tr></thead><tbody>"
-        
-        # Add table rows
-        for row in data:
-            html_content += "<tr>"
-            for col in visible_columns:
-                field_name = col.get("fieldname", "")
-                cell_value = row.get(field_name, "")
-                
-                # Format float values
-                if isinstance(cell_value, float):
-                    cell_value = "{:.2f}".format(cell_value)
-                
-                html_content += "<td>{0}</td>".format(cell_value)
-            html_content += "</tr>"
-        
-        html_content += "</tbody></table></div>"
-        
-        # Close HTML
-        html_content += """
-        </body>
-        </html>
-        """
+        # Charts are drawn from the report's chart data, the uploaded image is only a fallback
+        chart = result[3] if len(result) > 3 else None
+        charts = get_chart_svgs(filters, chart, report_name) if chart else None
         
         # Generate PDF with landscape orientation and adjusted margins
-        pdf_options = {
-            "orientation": "Landscape",
-            "page-size": "A4",
-            "margin-top": "10mm",
-            "margin-right": "10mm",
-            "margin-bottom": "10mm",
-            "margin-left": "10mm",
-            "print-media-type": True,
-            "dpi": 300,
-            "disable-smart-shrinking": True  # Add this to prevent shrinking
-        }
+        pdf_options = dict(report_pdf.PDF_OPTIONS)
+        pdf_options["disable-smart-shrinking"] = True  # Add this to prevent shrinking
         
-        pdf_data = get_pdf(html_content, options=pdf_options)
+        # Long tables are rendered in parallel chunks and merged
+        pdf_data = report_pdf.get_report_pdf(
+            report_name, columns, data, chart_image, options=pdf_options, charts=charts
+        )
         
         # Save PDF to a file
-        file_name = "{0}_{1}.pdf".format(
-            report_name.replace(" ", "_").lower(),
-            datetime.now().strftime("%Y%m%d_%H%M%S")
-        )
+        file_name = report_pdf.get_pdf_file_name(report_name)
         
         # Create a File record
         file_doc = frappe.get_doc({
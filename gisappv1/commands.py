@@ -0,0 +1,48 @@
+import click
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rebuild-survey-rollups")
+@click.option("--template", help="Only rebuild the rollups of this Research Template")
+@pass_context
+def rebuild_survey_rollups(context, template=None):
+	"Recompute the Survey Indicator Rollups from the raw survey responses"
+	import frappe
+
+	from gisappv1.gisappv1.doctype.survey_indicator_rollup.survey_indicator_rollup import rebuild_rollups
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		rebuild_rollups(template)
+		frappe.db.commit()
+	finally:
+		frappe.destroy()
+
+
+@click.command("explain-report-queries")
+@click.argument("template")
+@pass_context
+def explain_report_queries(context, template):
+	"Print the EXPLAIN plans of the Survey and Ground Water Report queries of a Research Template"
+	import frappe
+
+	from gisappv1.indexes import explain_report_queries
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		for query, plan in explain_report_queries(template):
+			click.secho(query, bold=True)
+			for row in plan:
+				click.echo(
+					"  {table}: type={type} key={key} rows={rows} extra={Extra}".format(
+						**{field: row.get(field) for field in ("table", "type", "key", "rows", "Extra")}
+					)
+				)
+			click.echo()
+	finally:
+		frappe.destroy()
+
+
+commands = [rebuild_survey_rollups, explain_report_queries]
@@ -0,0 +1,68 @@
+# Copyright (c) 2025, Ashish and contributors
+# For license information, please see license.txt
+
+import math
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, cint, now_datetime
+
+
+class ReportExecutionLog(Document):
+	pass
+
+
+def percentile(values, rank):
+	"""Nearest-rank percentile of `values`, None when there are none."""
+	if not values:
+		return None
+	values = sorted(values)
+	return values[max(math.ceil(rank / 100 * len(values)) - 1, 0)]
+
+
+@frappe.whitelist()
+def get_report_timings(report_name=None, days=7):
+	"""
+	p50/p95 of every recorded report phase
+
+	Args:
+		report_name (str): Only this report, every profiled report when empty
+		days (int): How far back to look
+
+	Returns:
+		list: One dict per (report, phase) with runs, p50/p95 wall time and peak memory, and average rows and queries
+	"""
+	frappe.only_for("System Manager")
+
+	filters = {"creation": (">=", add_days(now_datetime(), -cint(days)))}
+	if report_name:
+		filters["report_name"] = report_name
+
+	phases = {}
+	for log in frappe.get_all(
+		"Report Execution Log",
+		filters=filters,
+		fields=["report_name", "phase", "wall_time_ms", "row_count", "query_count", "peak_memory_kb"],
+		order_by="creation asc",
+	):
+		phases.setdefault((log.report_name, log.phase), []).append(log)
+
+	timings = []
+	for (report, phase), logs in phases.items():
+		wall_times = [log.wall_time_ms for log in logs]
+		memory = [log.peak_memory_kb for log in logs]
+		timings.append(
+			{
+				"report_name": report,
+				"phase": phase,
+				"runs": len(logs),
+				"p50_ms": percentile(wall_times, 50),
+				"p95_ms": percentile(wall_times, 95),
+				"p50_memory_kb": percentile(memory, 50),
+				"p95_memory_kb": percentile(memory, 95),
+				"avg_rows": sum(log.row_count for log in logs) / len(logs),
+				"avg_queries": sum(log.query_count for log in logs) / len(logs),
+			}
+		)
+
+	return sorted(timings, key=lambda timing: (timing["report_name"], -timing["p95_ms"]))
@@ -0,0 +1,35 @@
+# Copyright (c) 2025, Ashish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from gisappv1.gisappv1.doctype.report_execution_log.report_execution_log import percentile
+from gisappv1.profiling import phase, report_profile
+
+
+class TestReportExecutionLog(FrappeTestCase):
+	def test_percentile(self):
+		self.assertIsNone(percentile([], 50))
+		self.assertEqual(percentile([3, 1, 2], 50), 2)
+		self.assertEqual(percentile(list(range(1, 101)), 95), 95)
+
+	def test_report_profile(self):
+		frappe.local.conf.report_profiling = 1
+		try:
+			with report_profile("_Test Report", {"project_title": "_Test"}) as profile:
+				with phase("sql") as sql_phase:
+					frappe.db.sql("SELECT 1")
+					sql_phase.rows = 1
+		finally:
+			frappe.local.conf.report_profiling = 0
+
+		logs = frappe.get_all(
+			"Report Execution Log",
+			filters={"run_id": profile.run_id},
+			fields=["phase", "query_count", "row_count"],
+		)
+		phases = {log.phase: log for log in logs}
+		self.assertEqual(set(phases), {"sql", "total"})
+		self.assertEqual(phases["sql"].query_count, 1)
+		self.assertEqual(phases["sql"].row_count, 1)
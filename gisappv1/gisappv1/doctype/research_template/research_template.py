@@ -4,6 +4,16 @@
 # import frappe
 from frappe.model.document import Document
 
+from gisappv1.gisappv1.doctype.research_template.template_metadata import clear_template_meta
+
 
 class ResearchTemplate(Document):
-	pass
+	def on_update(self):
+		clear_template_meta(self.name)
+
+	def on_trash(self):
+		clear_template_meta(self.name)
+
+	def after_rename(self, old, new, merge=False):
+		clear_template_meta(old)
+		clear_template_meta(new)
@@ -0,0 +1,178 @@
+# Copyright (c) 2025, Ashish and contributors
+# For license information, please see license.txt
+
+import frappe
+
+# Bump when the cached structure changes so old entries are never read back
+CACHE_KEY = "research_template_meta:v1"
+
+PROJECT_COLUMN = {
+	"fieldname": "project_title",
+	"label": "Project",
+	"fieldtype": "Data",
+	"width": 150,
+}
+
+
+def to_camel_case(snake_str):
+	"""Convert snake_case or space-separated string to camelCase."""
+	components = snake_str.split("_")
+	camel_case_str = components[0] + "".join(x.title() for x in components[1:])
+	# Ensure there are no spaces or unexpected characters
+	return camel_case_str.replace(" ", "")
+
+
+def get_template_meta(research_template):
+	"""
+	Indicators, dimensions and report column keys of a Research Template
+
+	Loaded once and served from the cache until the template is saved again.
+
+	Args:
+		research_template (str): Name of the Research Template
+
+	Returns:
+		dict: {"name", "indicators": [...], "dimensions": [...]}, None if the template does not exist
+	"""
+	meta = frappe.cache().hget(CACHE_KEY, research_template)
+	if meta is None:
+		meta = load_template_meta(research_template)
+		if meta is not None:
+			frappe.cache().hset(CACHE_KEY, research_template, meta)
+	return meta
+
+
+def load_template_meta(research_template):
+	if not frappe.db.exists("Research Template", research_template):
+		return None
+
+	indicators = []
+	for indicator, dimension, weight in frappe.db.sql(
+		"""
+		SELECT indicators, dimension, weight_dimension
+		FROM `tabIndicators`
+		WHERE parent = %s AND parenttype = 'Research Template'
+		ORDER BY idx
+		""",
+		research_template,
+	):
+		key = to_camel_case(indicator or "")
+		indicators.append(
+			{
+				"indicator": indicator,
+				"dimension": dimension,
+				"weight": weight,
+				"key": key,
+				"columns": [
+					{
+						"fieldname": "variable1" + key,
+						"label": f"{indicator} Variable 1",
+						"fieldtype": "Float",
+						"width": 150,
+					},
+					{
+						"fieldname": "variable2" + key,
+						"label": f"{indicator} Variable 2",
+						"fieldtype": "Float",
+						"width": 200,
+					},
+				],
+			}
+		)
+
+	dimensions = frappe.db.sql(
+		"""
+		SELECT dimensions AS dimension, weightage
+		FROM `tabDimensions`
+		WHERE parent = %s AND parenttype = 'Research Template'
+		ORDER BY idx
+		""",
+		research_template,
+		as_dict=True,
+	)
+
+	return {"name": research_template, "indicators": indicators, "dimensions": dimensions}
+
+
+def get_all_template_indicators(research_templates=None):
+	"""
+	Indicators of many templates in one query, shaped like the `indicators` of get_template_meta
+
+	Returns:
+		dict: Template name -> indicators in template order, without their report columns
+	"""
+	query = """
+		SELECT parent, indicators, dimension, weight_dimension
+		FROM `tabIndicators`
+		WHERE parenttype = 'Research Template'
+	"""
+	parameters = []
+
+	if research_templates is not None:
+		if not research_templates:
+			return {}
+		query += " AND parent IN %s"
+		parameters.append(tuple(research_templates))
+
+	template_indicators = {}
+	for parent, indicator, dimension, weight in frappe.db.sql(query + " ORDER BY parent, idx", parameters):
+		template_indicators.setdefault(parent, []).append(
+			{
+				"indicator": indicator,
+				"dimension": dimension,
+				"weight": weight,
+				"key": to_camel_case(indicator or ""),
+			}
+		)
+	return template_indicators
+
+
+def clear_template_meta(research_template):
+	frappe.cache().hdel(CACHE_KEY, research_template)
+
+
+def get_template_indicators(meta, dimension="All Indicators"):
+	"""Indicators of the template that belong to `dimension`, all of them for "All Indicators"."""
+	if not meta:
+		return []
+	if dimension == "All Indicators":
+		return list(meta["indicators"])
+	return [indicator for indicator in meta["indicators"] if indicator["dimension"] == dimension]
+
+
+def get_report_columns(meta, dimension="All Indicators"):
+	"""Survey Report columns, the project column followed by variable1/variable2 of each indicator."""
+	columns = [dict(PROJECT_COLUMN)]
+	for indicator in get_template_indicators(meta, dimension):
+		columns.extend(dict(column) for column in indicator["columns"])
+	return columns
+
+
+def get_dimension_options(meta):
+	"""Dimension filter options, "All Indicators" followed by the unique template dimensions."""
+	options = ["All Indicators"]
+	for dimension in (meta or {}).get("dimensions", []):
+		if dimension["dimension"] and dimension["dimension"] not in options:
+			options.append(dimension["dimension"])
+	return options
+
+
+@frappe.whitelist()
+def get_report_filter_options(project_title, dimension="All Indicators"):
+	"""
+	Dimension options and column definitions of a Research Template for the Survey Report filters
+
+	Args:
+		project_title (str): Name of the Research Template
+		dimension (str): Selected dimension, "All Indicators" for none
+
+	Returns:
+		dict: {"dimensions": [...], "columns": [...]}
+	"""
+	frappe.has_permission("Research Template", "read", project_title, throw=True)
+
+	meta = get_template_meta(project_title)
+	return {
+		"dimensions": get_dimension_options(meta),
+		"columns": get_report_columns(meta, dimension or "All Indicators"),
+	}
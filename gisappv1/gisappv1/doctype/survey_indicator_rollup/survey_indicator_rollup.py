@@ -0,0 +1,421 @@
+# Copyright (c) 2025, Ashish and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import cint, flt, getdate, now
+
+# Indicator rows hold the running sums of one indicator, Dimension and
+# Template rows only count the surveys that answered anything in them.
+SCOPE_INDICATOR = "Indicator"
+SCOPE_DIMENSION = "Dimension"
+SCOPE_TEMPLATE = "Template"
+
+ROLLUP_FIELDS = ("sum_variable1", "sum_variable2", "entry_count", "survey_count")
+
+# Survey Indicator Trend rows carry the same sums per month of survey creation
+ROLLUP_DOCTYPE = "Survey Indicator Rollup"
+TREND_DOCTYPE = "Survey Indicator Trend"
+KEY_FIELDS = {
+	ROLLUP_DOCTYPE: ("scope", "research_template", "dimension", "indicator"),
+	TREND_DOCTYPE: ("scope", "research_template", "dimension", "indicator", "period"),
+}
+
+
+class SurveyIndicatorRollup(Document):
+	pass
+
+
+def get_rollup_name(key):
+	"""Stable name of the rollup row for a (scope, template, dimension, indicator[, period]) key."""
+	return hashlib.sha1("\x1f".join(key).encode()).hexdigest()
+
+
+def get_period(creation):
+	"""Trend bucket of a survey, the first day of the month it was created in."""
+	return getdate(creation).replace(day=1).isoformat()
+
+
+def add_survey_entries(totals, research_template, entries, sign=1, period=None):
+	"""
+	Add the contribution of one survey to `totals`
+
+	Args:
+		totals (dict): (scope, template, dimension, indicator[, period]) -> [sum_variable1, sum_variable2, entry_count, survey_count]
+		research_template (str): Template the survey belongs to
+		entries (list): (dimension, indicator, variable1, variable2) of every Data Entry Table row of the survey
+		sign (int): 1 to add the survey, -1 to take it out again
+		period (str): Trend bucket of the survey, the keys get it appended when given
+	"""
+	if not entries:
+		return totals
+
+	research_template = research_template or ""
+	suffix = (period,) if period else ()
+	answered = set()
+
+	for dimension, indicator, variable1, variable2 in entries:
+		dimension = dimension or ""
+		indicator = indicator or ""
+
+		for key in (
+			(SCOPE_INDICATOR, research_template, dimension, indicator, *suffix),
+			(SCOPE_DIMENSION, research_template, dimension, "", *suffix),
+			(SCOPE_TEMPLATE, research_template, "", "", *suffix),
+		):
+			row = totals.setdefault(key, [0.0, 0.0, 0, 0])
+			row[2] += sign
+
+			if key[0] == SCOPE_INDICATOR:
+				row[0] += sign * flt(variable1)
+				row[1] += sign * flt(variable2)
+
+			if key not in answered:
+				answered.add(key)
+				row[3] += sign
+
+	return totals
+
+
+def get_survey_entries(doc):
+	"""The (dimension, indicator, variable1, variable2) rows of a Research Survey document."""
+	return [
+		(row.dimension, row.indicator, row.variable1, row.variable2) for row in doc.get("table_bgyj") or []
+	]
+
+
+def get_survey_delta(doc, previous=None, by_period=False):
+	"""Change in the rollups (or the trends, `by_period`) when `previous` is replaced by `doc`, either may be None."""
+	totals = {}
+
+	if previous and previous.docstatus != 2:
+		period = get_period(previous.creation) if by_period else None
+		add_survey_entries(totals, previous.project_title, get_survey_entries(previous), sign=-1, period=period)
+
+	if doc and doc.docstatus != 2:
+		period = get_period(doc.creation) if by_period else None
+		add_survey_entries(totals, doc.project_title, get_survey_entries(doc), period=period)
+
+	return totals
+
+
+def apply_survey_delta(doc, previous=None):
+	apply_rollup_delta(get_survey_delta(doc, previous))
+	apply_rollup_delta(get_survey_delta(doc, previous, by_period=True), TREND_DOCTYPE)
+
+
+def apply_rollup_delta(totals, doctype=ROLLUP_DOCTYPE):
+	"""Atomically add `totals` to the stored rollups (or trends) and drop rows that fell back to zero."""
+	key_fields = KEY_FIELDS[doctype]
+	values = []
+	names = []
+	timestamp = now()
+	user = frappe.session.user
+
+	for key, (sum_variable1, sum_variable2, entry_count, survey_count) in totals.items():
+		if not (sum_variable1 or sum_variable2 or entry_count or survey_count):
+			continue
+
+		name = get_rollup_name(key)
+		names.append(name)
+		values.extend(
+			[name, timestamp, timestamp, user, user, *key, sum_variable1, sum_variable2, entry_count, survey_count]
+		)
+
+	if not names:
+		return
+
+	row_placeholder = "(" + ", ".join(["%s"] * (5 + len(key_fields) + len(ROLLUP_FIELDS))) + ")"
+	placeholders = ", ".join([row_placeholder] * len(names))
+
+	frappe.db.sql(
+		f"""
+		INSERT INTO `tab{doctype}`
+			(name, creation, modified, owner, modified_by, {", ".join(key_fields)},
+			sum_variable1, sum_variable2, entry_count, survey_count)
+		VALUES {placeholders}
+		ON DUPLICATE KEY UPDATE
+			sum_variable1 = sum_variable1 + VALUES(sum_variable1),
+			sum_variable2 = sum_variable2 + VALUES(sum_variable2),
+			entry_count = entry_count + VALUES(entry_count),
+			survey_count = survey_count + VALUES(survey_count),
+			modified = VALUES(modified),
+			modified_by = VALUES(modified_by)
+		""",
+		values,
+	)
+
+	frappe.db.sql(
+		f"""
+		DELETE FROM `tab{doctype}`
+		WHERE name IN %(names)s AND entry_count <= 0 AND survey_count <= 0
+		""",
+		{"names": tuple(names)},
+	)
+
+
+def on_survey_update(doc, method=None):
+	apply_survey_delta(doc, doc.get_doc_before_save())
+
+
+def on_survey_trash(doc, method=None):
+	apply_survey_delta(None, doc)
+
+
+def on_template_rename(doc, method=None, old=None, new=None, merge=False):
+	# Renaming rewrites the template links but the row names still hash the old name
+	rebuild_rollups(new)
+
+
+def get_indicator_totals(research_template, dimension="All Indicators"):
+	"""
+	Survey count and per-indicator running sums of a template
+
+	Args:
+		research_template (str): Name of the Research Template
+		dimension (str): Dimension to restrict to, "All Indicators" for none
+
+	Returns:
+		tuple: (survey count, rows of (indicator, sum_variable1, sum_variable2))
+	"""
+	query = """
+		SELECT scope, indicator, sum_variable1, sum_variable2, survey_count
+		FROM `tabSurvey Indicator Rollup`
+		WHERE research_template = %s
+	"""
+	parameters = [research_template]
+
+	if dimension == "All Indicators":
+		count_scope = SCOPE_TEMPLATE
+	else:
+		count_scope = SCOPE_DIMENSION
+		query += " AND dimension = %s"
+		parameters.append(dimension)
+
+	survey_count = 0
+	indicator_totals = []
+
+	for scope, indicator, sum_variable1, sum_variable2, scope_survey_count in frappe.db.sql(query, parameters):
+		if scope == SCOPE_INDICATOR:
+			indicator_totals.append((indicator, sum_variable1, sum_variable2))
+		elif scope == count_scope:
+			survey_count = scope_survey_count
+
+	return survey_count, indicator_totals
+
+
+def get_indicator_catalog(research_template=None, dimension=None, from_date=None, to_date=None):
+	"""
+	Indicators answered in any active survey, with the number of responses that use them
+
+	Read from the Indicator rollups, whose entry counts are the reference
+	counts kept up to date by the survey events. With a date range the
+	monthly trends are read instead, so every month the range touches counts
+	as a whole.
+
+	Args:
+		research_template (str): Only indicators of this template, of every template when None
+		dimension (str): Only indicators of this dimension, "All Indicators" or None for all of them
+		from_date (str): Only surveys created from this month on
+		to_date (str): Only surveys created up to this month
+
+	Returns:
+		list: (indicator, references) ordered by indicator
+	"""
+	doctype = TREND_DOCTYPE if from_date or to_date else ROLLUP_DOCTYPE
+	query = f"""
+		SELECT indicator, SUM(entry_count) AS references_count
+		FROM `tab{doctype}`
+		WHERE scope = %s AND indicator != '' AND entry_count > 0
+	"""
+	parameters = [SCOPE_INDICATOR]
+
+	if research_template is not None:
+		query += " AND research_template = %s"
+		parameters.append(research_template)
+	if dimension and dimension != "All Indicators":
+		query += " AND dimension = %s"
+		parameters.append(dimension)
+	if from_date:
+		query += " AND period >= %s"
+		parameters.append(get_period(from_date))
+	if to_date:
+		query += " AND period <= %s"
+		parameters.append(get_period(to_date))
+
+	return [
+		(indicator, cint(references))
+		for indicator, references in frappe.db.sql(query + " GROUP BY indicator ORDER BY indicator", parameters)
+	]
+
+
+def get_entry_count(research_template, dimension="All Indicators"):
+	"""Number of survey responses (child rows) of a template, without reading them."""
+	query = """
+		SELECT IFNULL(SUM(entry_count), 0)
+		FROM `tabSurvey Indicator Rollup`
+		WHERE research_template = %s AND scope = %s
+	"""
+	parameters = [research_template, SCOPE_INDICATOR]
+
+	if dimension and dimension != "All Indicators":
+		query += " AND dimension = %s"
+		parameters.append(dimension)
+
+	return cint(frappe.db.sql(query, parameters)[0][0])
+
+
+def get_all_indicator_totals(research_templates=None):
+	"""
+	Survey count and per-indicator running sums of many templates in one query
+
+	Args:
+		research_templates (list): Only these templates, every template with surveys when None
+
+	Returns:
+		dict: Template name -> (survey count, rows of (indicator, sum_variable1, sum_variable2))
+	"""
+	query = """
+		SELECT research_template, scope, indicator, sum_variable1, sum_variable2, survey_count
+		FROM `tabSurvey Indicator Rollup`
+		WHERE scope IN %s
+	"""
+	parameters = [(SCOPE_INDICATOR, SCOPE_TEMPLATE)]
+
+	if research_templates is not None:
+		if not research_templates:
+			return {}
+		query += " AND research_template IN %s"
+		parameters.append(tuple(research_templates))
+
+	totals = {}
+	for template, scope, indicator, sum_variable1, sum_variable2, survey_count in frappe.db.sql(query, parameters):
+		template_totals = totals.setdefault(template, [0, []])
+		if scope == SCOPE_INDICATOR:
+			template_totals[1].append((indicator, sum_variable1, sum_variable2))
+		else:
+			template_totals[0] = survey_count
+
+	return {template: tuple(template_totals) for template, template_totals in totals.items()}
+
+
+def get_trend_totals(research_template, from_date=None, to_date=None):
+	"""
+	Survey count and per-indicator sums of a template for every month with surveys
+
+	Args:
+		research_template (str): Name of the Research Template
+		from_date (str): Only months from this date on
+		to_date (str): Only months up to this date
+
+	Returns:
+		dict: Period (first day of the month) -> (survey count, rows of (indicator, sum_variable1, sum_variable2)),
+			in chronological order
+	"""
+	query = """
+		SELECT period, scope, indicator, sum_variable1, sum_variable2, survey_count
+		FROM `tabSurvey Indicator Trend`
+		WHERE research_template = %s AND scope IN %s
+	"""
+	parameters = [research_template, (SCOPE_INDICATOR, SCOPE_TEMPLATE)]
+
+	if from_date:
+		query += " AND period >= %s"
+		parameters.append(get_period(from_date))
+	if to_date:
+		query += " AND period <= %s"
+		parameters.append(get_period(to_date))
+
+	periods = {}
+	for period, scope, indicator, sum_variable1, sum_variable2, survey_count in frappe.db.sql(
+		query + " ORDER BY period", parameters
+	):
+		period_totals = periods.setdefault(getdate(period).isoformat(), [0, []])
+		if scope == SCOPE_INDICATOR:
+			period_totals[1].append((indicator, sum_variable1, sum_variable2))
+		else:
+			period_totals[0] = survey_count
+
+	return {period: tuple(period_totals) for period, period_totals in periods.items()}
+
+
+def get_survey_templates():
+	"""Every project_title in use by a Research Survey, "" for surveys without one."""
+	return [
+		template or ""
+		for template in frappe.db.sql_list(
+			"SELECT DISTINCT IFNULL(project_title, '') FROM `tabResearch Survey` WHERE docstatus < 2"
+		)
+	]
+
+
+def rebuild_rollups(research_template=None):
+	"""
+	Recompute the rollups from the raw survey responses
+
+	Used to backfill the rollups and to repair drift caused by writes that
+	bypassed the document events. Rebuilds a single template when given.
+	"""
+	if research_template is None:
+		for doctype in KEY_FIELDS:
+			frappe.db.delete(doctype)
+		templates = get_survey_templates()
+	else:
+		for doctype in KEY_FIELDS:
+			frappe.db.delete(doctype, {"research_template": research_template})
+		templates = [research_template]
+
+	for template in templates:
+		totals, trends = {}, {}
+
+		if template:
+			condition, parameters = "parent.project_title = %s", [template]
+		else:
+			condition, parameters = "(parent.project_title IS NULL OR parent.project_title = '')", []
+
+		current_parent, current_period, entries = None, None, []
+		for parent, creation, dimension, indicator, variable1, variable2 in frappe.db.sql(
+			f"""
+			SELECT child.parent, parent.creation, child.dimension, child.indicator, child.variable1, child.variable2
+			FROM `tabResearch Survey` AS parent
+			JOIN `tabData Entry Table` AS child ON child.parent = parent.name
+			WHERE {condition} AND parent.docstatus < 2 AND child.parenttype = 'Research Survey'
+			ORDER BY child.parent
+			""",
+			parameters,
+		):
+			if parent != current_parent:
+				add_survey_entries(totals, template, entries)
+				add_survey_entries(trends, template, entries, period=current_period)
+				current_parent, current_period, entries = parent, get_period(creation), []
+			entries.append((dimension, indicator, variable1, variable2))
+
+		add_survey_entries(totals, template, entries)
+		add_survey_entries(trends, template, entries, period=current_period)
+		insert_rollups(totals)
+		insert_rollups(trends, TREND_DOCTYPE)
+
+
+def insert_rollups(totals, doctype=ROLLUP_DOCTYPE):
+	timestamp = now()
+	user = frappe.session.user
+
+	frappe.db.bulk_insert(
+		doctype,
+		fields=[
+			"name",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+			*KEY_FIELDS[doctype],
+			*ROLLUP_FIELDS,
+		],
+		values=[
+			(get_rollup_name(key), timestamp, timestamp, user, user, *key, *row)
+			for key, row in totals.items()
+			if row[2] or row[3]
+		],
+	)
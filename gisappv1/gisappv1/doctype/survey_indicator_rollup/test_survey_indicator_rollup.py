@@ -0,0 +1,67 @@
+# Copyright (c) 2025, Ashish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from gisappv1.gisappv1.doctype.survey_indicator_rollup.survey_indicator_rollup import (
+	get_indicator_totals,
+	rebuild_rollups,
+)
+from gisappv1.gisappv1.report.survey_report.test_survey_report import (
+	TEST_TEMPLATE,
+	make_test_survey,
+	make_test_template,
+)
+
+
+def get_rollup_rows():
+	return frappe.get_all(
+		"Survey Indicator Rollup",
+		filters={"research_template": TEST_TEMPLATE},
+		fields=["scope", "dimension", "indicator", "sum_variable1", "sum_variable2", "entry_count", "survey_count"],
+		order_by="scope, dimension, indicator",
+	)
+
+
+def get_totals():
+	count, totals = get_indicator_totals(TEST_TEMPLATE)
+	soil_count, _totals = get_indicator_totals(TEST_TEMPLATE, "Soil")
+	result = {"count": count, "soil_count": soil_count, "Rain Fall": (0, 0), "Clay": (0, 0)}
+	result.update({indicator: (variable1, variable2) for indicator, variable1, variable2 in totals})
+	return result
+
+
+class TestSurveyIndicatorRollup(FrappeTestCase):
+	def setUp(self):
+		make_test_template()
+		rebuild_rollups(TEST_TEMPLATE)
+
+	def test_running_totals(self):
+		before = get_totals()
+		first = make_test_survey({"Rain Fall": (1, 2), "Clay": (3, 1)})
+		make_test_survey({"Rain Fall": (3, 3)})
+
+		after = get_totals()
+		self.assertEqual(after["count"], before["count"] + 2)
+		self.assertEqual(after["soil_count"], before["soil_count"] + 1)
+		self.assertEqual(after["Rain Fall"], (before["Rain Fall"][0] + 4, before["Rain Fall"][1] + 5))
+
+		first.table_bgyj[0].variable1 = 2
+		first.save()
+		self.assertEqual(get_totals()["Rain Fall"][0], before["Rain Fall"][0] + 5)
+
+		first.delete()
+		after = get_totals()
+		self.assertEqual(after["count"], before["count"] + 1)
+		self.assertEqual(after["Clay"], before["Clay"])
+
+	def test_rebuild_matches_incremental(self):
+		survey = make_test_survey({"Rain Fall": (1, 2), "Clay": (3, 1)})
+		survey.append("table_bgyj", {"indicator": "Clay", "dimension": "Soil", "variable1": 2, "variable2": 2})
+		survey.save()
+		make_test_survey({"Clay": (0, 1)})
+
+		incremental = get_rollup_rows()
+		rebuild_rollups(TEST_TEMPLATE)
+		self.assertEqual(incremental, get_rollup_rows())
@@ -0,0 +1,10 @@
+# Copyright (c) 2025, Ashish and contributors
+# For license information, please see license.txt
+
+# import frappe
+from frappe.model.document import Document
+
+
+class SurveyIndicatorTrend(Document):
+	# Maintained together with the Survey Indicator Rollups, see survey_indicator_rollup.py
+	pass
@@ -0,0 +1,54 @@
+# Copyright (c) 2025, Ashish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate, nowdate
+
+from gisappv1.api.gwgi import get_gwgi_trend
+from gisappv1.gisappv1.doctype.survey_indicator_rollup.survey_indicator_rollup import rebuild_rollups
+from gisappv1.gisappv1.report.survey_report.test_survey_report import (
+	TEST_TEMPLATE,
+	make_test_survey,
+	make_test_template,
+)
+
+
+def get_trend_rows():
+	return frappe.get_all(
+		"Survey Indicator Trend",
+		filters={"research_template": TEST_TEMPLATE},
+		fields=["scope", "dimension", "indicator", "period", "sum_variable1", "sum_variable2", "entry_count", "survey_count"],
+		order_by="period, scope, dimension, indicator",
+	)
+
+
+def get_current_month():
+	trend = get_gwgi_trend(TEST_TEMPLATE, from_date=nowdate(), to_date=nowdate())
+	return dict(zip(trend["columns"], trend["data"][0])) if trend["data"] else {"survey_count": 0}
+
+
+class TestSurveyIndicatorTrend(FrappeTestCase):
+	def setUp(self):
+		make_test_template()
+		rebuild_rollups(TEST_TEMPLATE)
+
+	def test_current_month(self):
+		before = get_current_month()["survey_count"]
+		survey = make_test_survey({"Rain Fall": (1, 2), "Clay": (3, 1)})
+
+		month = get_current_month()
+		self.assertEqual(month["period"], getdate(nowdate()).replace(day=1).isoformat())
+		self.assertEqual(month["survey_count"], before + 1)
+
+		survey.delete()
+		self.assertEqual(get_current_month()["survey_count"], before)
+
+	def test_rebuild_matches_incremental(self):
+		survey = make_test_survey({"Rain Fall": (1, 2)})
+		survey.append("table_bgyj", {"indicator": "Clay", "dimension": "Soil", "variable1": 2, "variable2": 2})
+		survey.save()
+
+		incremental = get_trend_rows()
+		rebuild_rollups(TEST_TEMPLATE)
+		self.assertEqual(incremental, get_trend_rows())
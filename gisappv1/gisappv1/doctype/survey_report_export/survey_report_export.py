@@ -0,0 +1,12 @@
+# Copyright (c) 2025, Ashish and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class SurveyReportExport(Document):
+	def after_delete(self):
+		# The File links to nothing else, it goes with its export
+		if frappe.db.exists("File", self.file):
+			frappe.delete_doc("File", self.file, ignore_permissions=True)
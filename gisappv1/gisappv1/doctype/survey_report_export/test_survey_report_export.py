@@ -0,0 +1,22 @@
+# Copyright (c) 2025, Ashish and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from gisappv1.gisappv1.report.survey_report.survey_report_export import get_export_files, register_export_file
+
+
+class TestSurveyReportExport(FrappeTestCase):
+	def test_delete_with_file(self):
+		file_doc = frappe.get_doc(
+			{"doctype": "File", "file_name": "_test_survey_report_bulk.zip", "content": b"PK", "is_private": 1}
+		).insert()
+		register_export_file(file_doc.name)
+
+		export = frappe.get_last_doc("Survey Report Export", {"file": file_doc.name})
+		self.assertIsNone(export.research_template)
+		self.assertIn(file_doc.name, [export.file for export in get_export_files()])
+
+		export.delete()
+		self.assertFalse(frappe.db.exists("File", file_doc.name))
@@ -0,0 +1,119 @@
+# Copyright (c) 2025, Ashish and contributors
+# For license information, please see license.txt
+
+PRECISION = 3
+
+
+class RunningStats:
+    """
+    Sum, count and, when asked for, Welford mean and variance of a stream of values
+
+    Values are added one at a time, nothing is kept but the running figures.
+    """
+
+    __slots__ = ("count", "total", "mean", "m2", "track_variance")
+
+    def __init__(self, track_variance=False):
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.track_variance = track_variance
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if self.track_variance:
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (value - self.mean)
+
+    def with_zeros(self, count):
+        """
+        The figures as if `count` zeros had been added as well
+
+        Responses that do not answer an indicator count as 0 in its averages,
+        this merges them in without adding them one by one.
+        """
+        stats = RunningStats(self.track_variance)
+        stats.count = self.count + count
+        stats.total = self.total
+        if self.track_variance and stats.count:
+            # Chan et al. merge of the values with a group of zeros (mean 0, m2 0)
+            stats.mean = self.mean * self.count / stats.count
+            stats.m2 = self.m2 + self.mean**2 * self.count * count / stats.count
+        return stats
+
+    def average(self):
+        return self.total / self.count if self.count else 0
+
+    def variance(self):
+        """Population variance, only available with `track_variance`."""
+        if not self.track_variance:
+            raise ValueError("Variance is not tracked")
+        return self.m2 / self.count if self.count else 0.0
+
+
+class IndicatorAccumulator:
+    """
+    Running figures of the Ground Water Report responses, per indicator
+
+    Every response answers one indicator, and counts as 0 for all the
+    others. The Average rows are computed from the sums and the number of
+    responses, so the responses themselves never have to be kept.
+    """
+
+    def __init__(self, track_variance=False):
+        self.track_variance = track_variance
+        self.response_count = 0
+        # indicator -> (variable1, variable2) stats of the responses that answered it
+        self.stats = {}
+
+    def add(self, indicator, variable1, variable2):
+        self.response_count += 1
+        stats = self.stats.get(indicator)
+        if stats is None:
+            stats = self.stats[indicator] = (RunningStats(self.track_variance), RunningStats(self.track_variance))
+        stats[0].add(variable1)
+        stats[1].add(variable2)
+
+    def get_stats(self, indicator):
+        """(variable1, variable2) stats of an indicator over all responses, the ones that did not answer it as 0."""
+        variable1, variable2 = self.stats[indicator]
+        unanswered = self.response_count - variable1.count
+        return variable1.with_zeros(unanswered), variable2.with_zeros(unanswered)
+
+    def variance(self, indicator):
+        """Population variance of variable1 and variable2 of an indicator, over all responses."""
+        variable1, variable2 = self.get_stats(indicator)
+        return variable1.variance(), variable2.variance()
+
+    def summary_rows(self):
+        """The Average1, Average2 and Average3 rows, in a single pass over the indicators."""
+        avg1_row = {"response": "Average1"}
+        avg2_row = {"response": "Average2"}
+        avg3_row = {"response": "Average3"}
+        avg2_total = 0
+
+        for indicator in self.stats:
+            variable1, variable2 = self.get_stats(indicator)
+            var1_avg = variable1.average()
+            var2_avg = variable2.average()
+
+            avg1_row[f"{indicator}_var1"] = round(var1_avg, PRECISION)
+            avg1_row[f"{indicator}_var2"] = round(var2_avg, PRECISION)
+            avg1_row[f"{indicator}_avg1"] = round((var1_avg + var2_avg) / 2, PRECISION)
+
+            # Average2 repeats the rounded Average1 figures
+            for suffix in ("var1", "var2", "avg1"):
+                avg2_row[f"{indicator}_{suffix}"] = round(avg1_row[f"{indicator}_{suffix}"], PRECISION)
+            avg2_total += avg2_row[f"{indicator}_avg1"]
+
+        # Average3 is the mean of the indicator averages, the same in every column
+        avg3 = avg2_total / len(self.stats) if self.stats else 0
+        for indicator in self.stats:
+            avg3_row[f"{indicator}_var1"] = 0
+            avg3_row[f"{indicator}_var2"] = 0
+            avg3_row[f"{indicator}_avg1"] = round(avg3, PRECISION) if avg3 else 0
+
+        return [avg1_row, avg2_row, avg3_row]
@@ -3,6 +3,59 @@
 
 frappe.query_reports["Ground Water Report"] = {
 	"filters": [
+		{
+			"fieldname": "project_title",
+			"label": __("Project"),
+			"fieldtype": "Link",
+			"options": "Research Template",
+			"reqd": 0,
+			"on_change": function() {
+				let selected_template = frappe.query_report.get_filter_value('project_title');
+				let dimension_filter = frappe.query_report.get_filter('dimension');
 
+				if (!selected_template) {
+					// Dimensions only make sense within a template
+					dimension_filter.df.options = "";
+					dimension_filter.refresh();
+					frappe.query_report.set_filter_value('dimension', "");
+					return;
+				}
+
+				frappe.call({
+					method: "gisappv1.gisappv1.doctype.research_template.template_metadata.get_report_filter_options",
+					args: {
+						project_title: selected_template
+					},
+					callback: function(response) {
+						if (response.message) {
+							// "All Indicators" followed by the unique template dimensions
+							dimension_filter.df.options = response.message.dimensions;
+							dimension_filter.refresh();
+							frappe.query_report.set_filter_value('dimension', "All Indicators");
+						}
+					}
+				});
+			}
+		},
+		{
+			"fieldname": "dimension",
+			"label": __("Dimensions"),
+			"fieldtype": "Select",
+			"options": "",  // Populated from the selected template
+			"depends_on": "eval:doc.project_title",
+			"reqd": 0
+		},
+		{
+			"fieldname": "from_date",
+			"label": __("From Date"),
+			"fieldtype": "Date",
+			"reqd": 0
+		},
+		{
+			"fieldname": "to_date",
+			"label": __("To Date"),
+			"fieldtype": "Date",
+			"reqd": 0
+		}
 	]
 };
@@ -1,27 +1,60 @@
+import json
+
 import frappe
 from frappe import _
+from frappe.utils import add_days, getdate
+
+from gisappv1.gisappv1.doctype.survey_indicator_rollup.survey_indicator_rollup import get_indicator_catalog
+from gisappv1.gisappv1.report.ground_water_report.accumulators import IndicatorAccumulator
+from gisappv1.profiling import phase, report_profile
+
+COLUMN_CACHE_KEY = "ground_water_report_columns"
 
 def execute(filters=None):
-    columns = get_columns(filters)
-    data = get_data(filters)
+    with report_profile("Ground Water Report", filters):
+        with phase("get_columns") as columns_phase:
+            columns = get_columns(filters)
+            columns_phase.rows = len(columns)
+        with phase("get_data") as data_phase:
+            data = get_data(filters)
+            data_phase.rows = len(data)
     return columns, data
 
+def get_filter_scope(filters):
+    """The filters the report applies, with empty ones as None."""
+    filters = filters or {}
+    dimension = filters.get("dimension")
+    return frappe._dict(
+        project_title=filters.get("project_title") or None,
+        dimension=dimension if dimension and dimension != "All Indicators" else None,
+        from_date=filters.get("from_date") or None,
+        to_date=filters.get("to_date") or None,
+    )
+
+def get_scope_key(scope):
+    return json.dumps([scope.project_title, scope.dimension, scope.from_date, scope.to_date], default=str)
+
+def get_indicators(filters):
+    """Indicators in use within the filters, from the maintained catalog and cached until a survey is written."""
+    scope = get_filter_scope(filters)
+    scope_key = get_scope_key(scope)
+    indicators = frappe.cache().hget(COLUMN_CACHE_KEY, scope_key)
+    if indicators is None:
+        # Instead of a DISTINCT over every response
+        catalog = get_indicator_catalog(scope.project_title, scope.dimension, scope.from_date, scope.to_date)
+        indicators = [indicator for indicator, _references in catalog]
+        frappe.cache().hset(COLUMN_CACHE_KEY, scope_key, indicators)
+    return indicators
+
 def get_columns(filters):
-    
-    indicators = frappe.db.sql("""
-        SELECT DISTINCT indicator
-        FROM `tabData Entry Table`
-        WHERE parenttype = 'Research Survey'
-        ORDER BY indicator
-    """, as_dict=True)
+    indicators = get_indicators(filters)
 
     columns = [
         {"label": _("Response"), "fieldname": "response", "fieldtype": "Data", "width": 100}
     ]
 
     
-    for ind in indicators:
-        indicator = ind.get("indicator")
+    for indicator in indicators:
         columns.append({
             "label": _(f"{indicator} - Variable1"),
             "fieldname": f"{indicator}_var1",
@@ -43,82 +76,85 @@ def get_columns(filters):
 
     return columns
 
-def get_data(filters):
-    data = []
-    
-    projects = frappe.get_all("Research Survey", filters=filters, fields=["name", "project_title"])
+def clear_column_cache(doc=None, method=None, *args, **kwargs):
+    frappe.cache().delete_value(COLUMN_CACHE_KEY)
+    # A report running alongside this transaction could cache the columns it still saw
+    frappe.db.after_commit.add(lambda: frappe.cache().delete_value(COLUMN_CACHE_KEY))
 
-    
-    all_response_data = []
-    indicator_list = set()
+def get_survey_responses(filters):
+    """
+    Every Data Entry Table row of the matching Research Surveys, in one query
 
-    
-    response_counter = 0
-    child_data_by_response = {}
-    
-    for project in projects:
-        child_data = frappe.get_all("Data Entry Table",
-                                  filters={"parenttype": "Research Survey", "parent": project.name},
-                                  fields=["indicator", "variable1", "variable2"])
-        
-        
-        for child in child_data:
-            response_counter += 1
-            if response_counter not in child_data_by_response:
-                child_data_by_response[response_counter] = []
-            child_data_by_response[response_counter].append(child)
-            indicator_list.add(child.indicator)
+    Surveys come in the list order of Research Survey (latest modified first)
+    and their rows in table order. The rows are streamed from an unbuffered
+    cursor, consume them before running another query.
 
-    
-    for response_idx in range(1, response_counter + 1):
-        row = {"response": f"Response {response_idx}"}
-        child_entries = child_data_by_response.get(response_idx, [])
-        
-        
-        for ind in indicator_list:
-            row[f"{ind}_var1"] = 0
-            row[f"{ind}_var2"] = 0
-            row[f"{ind}_avg1"] = 0
-
-        
-        for child in child_entries:
-            ind = child.indicator
-            row[f"{ind}_var1"] = float(child.variable1 or 0)
-            row[f"{ind}_var2"] = float(child.variable2 or 0)
-            row[f"{ind}_avg1"] = (row[f"{ind}_var1"] + row[f"{ind}_var2"]) / 2 if row[f"{ind}_var1"] is not None and row[f"{ind}_var2"] is not None else 0
-        
-        data.append(row)
-        all_response_data.append(row)
+    Args:
+        filters (dict): Report filters, project_title, dimension, from_date and to_date are applied
 
-    
-    avg1_row = {"response": "Average1"}
-    for ind in indicator_list:
-        var1_values = [row.get(f"{ind}_var1", 0) for row in all_response_data]
-        var2_values = [row.get(f"{ind}_var2", 0) for row in all_response_data]
-        var1_avg = sum(var1_values) / len(var1_values) if var1_values else 0
-        var2_avg = sum(var2_values) / len(var2_values) if var2_values else 0
-        avg1_row[f"{ind}_var1"] = round(var1_avg, 3)
-        avg1_row[f"{ind}_var2"] = round(var2_avg, 3)
-        avg1_row[f"{ind}_avg1"] = round((var1_avg + var2_avg) / 2, 3) if var1_avg is not None and var2_avg is not None else 0
-    data.append(avg1_row)
+    Returns:
+        iterator: Rows of (indicator, variable1, variable2)
+    """
+    scope = get_filter_scope(filters)
+    query = """
+        SELECT child.indicator, child.variable1, child.variable2
+        FROM `tabResearch Survey` AS parent
+        JOIN `tabData Entry Table` AS child
+            ON child.parent = parent.name AND child.parenttype = 'Research Survey'
+    """
+    conditions = []
 
-    
-    avg2_row = {"response": "Average2"}
-    for ind in indicator_list:
-        avg1 = avg1_row[f"{ind}_avg1"]
-        avg2_row[f"{ind}_var1"] = round(avg1_row[f"{ind}_var1"], 3)
-        avg2_row[f"{ind}_var2"] = round(avg1_row[f"{ind}_var2"], 3)
-        avg2_row[f"{ind}_avg1"] = round(avg1, 3)
-    data.append(avg2_row)
+    # project_title_creation_index and parent_dimension_indicator_index serve these
+    if scope.project_title:
+        conditions.append("parent.project_title = %(project_title)s")
+    if scope.from_date:
+        conditions.append("parent.creation >= %(from_date)s")
+    if scope.to_date:
+        # Surveys created at any time of the last day
+        conditions.append("parent.creation < %(before_date)s")
+        scope.before_date = add_days(getdate(scope.to_date), 1)
+    if scope.dimension:
+        conditions.append("child.dimension = %(dimension)s")
 
-    
-    avg3_row = {"response": "Average3"}
-    avg2_values = [avg2_row.get(f"{ind}_avg1", 0) for ind in indicator_list]
-    avg3 = sum(avg2_values) / len(avg2_values) if avg2_values else 0
-    for ind in indicator_list:
-        avg3_row[f"{ind}_var1"] = 0  
-        avg3_row[f"{ind}_var2"] = 0
-        avg3_row[f"{ind}_avg1"] = round(avg3, 3) if avg3 else 0
-    data.append(avg3_row)
-
-    return data
\ No newline at end of file
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY parent.modified DESC, parent.name, child.idx"
+
+    return frappe.db.sql(query, scope, as_iterator=True)
+
+def iter_response_rows(responses, indicators, accumulator):
+    """
+    Yield one report row per response, adding it to the accumulator on the way
+
+    Args:
+        responses: (indicator, variable1, variable2) of every response
+        indicators (list): Indicators every row has columns for, set to 0 when not answered
+        accumulator (IndicatorAccumulator): Collects the figures of the Average rows
+    """
+    empty_row = {}
+    for indicator in indicators:
+        empty_row[f"{indicator}_var1"] = 0
+        empty_row[f"{indicator}_var2"] = 0
+        empty_row[f"{indicator}_avg1"] = 0
+
+    for response_idx, (indicator, variable1, variable2) in enumerate(responses, 1):
+        variable1 = float(variable1 or 0)
+        variable2 = float(variable2 or 0)
+        accumulator.add(indicator, variable1, variable2)
+
+        row = {"response": f"Response {response_idx}", **empty_row}
+        row[f"{indicator}_var1"] = variable1
+        row[f"{indicator}_var2"] = variable2
+        row[f"{indicator}_avg1"] = (variable1 + variable2) / 2
+        yield row
+
+def get_data(filters):
+    accumulator = IndicatorAccumulator()
+    # Read before the responses stream in, a query on the connection would discard the unread rows
+    indicators = get_indicators(filters)
+
+    # Every response row of every survey in a single round trip instead of one query per survey
+    with frappe.db.unbuffered_cursor():
+        data = list(iter_response_rows(get_survey_responses(filters), indicators, accumulator))
+
+    return data + accumulator.summary_rows()
@@ -0,0 +1,114 @@
+# Copyright (c) 2025, Ashish and Contributors
+# See license.txt
+
+from statistics import pvariance
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from gisappv1.gisappv1.report.ground_water_report.accumulators import IndicatorAccumulator
+from gisappv1.gisappv1.report.ground_water_report.ground_water_report import (
+	clear_column_cache,
+	get_columns,
+	get_data,
+	get_survey_responses,
+	iter_response_rows,
+)
+from gisappv1.gisappv1.report.survey_report.test_survey_report import (
+	TEST_TEMPLATE,
+	make_test_survey,
+	make_test_template,
+)
+
+
+def count_queries(filters):
+	# Always the column cache miss, so runs compare and the catalog query is covered
+	clear_column_cache()
+	with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql:
+		data = get_data(filters)
+	return sql.call_count, data
+
+
+class TestGroundWaterReport(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_template()
+		make_test_survey({"Rain Fall": (1, 3), "Clay": (2, 2)})
+
+	def test_query_count_does_not_grow_with_surveys(self):
+		filters = {"project_title": TEST_TEMPLATE}
+		queries, data = count_queries(filters)
+
+		for _i in range(3):
+			make_test_survey({"Rain Fall": (1, 1), "Clay": (3, 3)})
+
+		more_queries, more_data = count_queries(filters)
+		self.assertEqual(more_queries, queries)
+		self.assertEqual(len(more_data), len(data) + 6)
+
+	def test_response_rows(self):
+		_queries, data = count_queries({"project_title": TEST_TEMPLATE})
+		responses = [row for row in data if row["response"].startswith("Response")]
+
+		self.assertEqual(len(responses), len(data) - 3)
+		self.assertEqual([row["response"] for row in data[-3:]], ["Average1", "Average2", "Average3"])
+		for row in responses:
+			answered = [key for key, value in row.items() if key.endswith("_avg1") and value]
+			self.assertLessEqual(len(answered), 1)
+
+	def test_columns_follow_the_indicator_catalog(self):
+		filters = {"project_title": TEST_TEMPLATE}
+		fieldnames = [column["fieldname"] for column in get_columns(filters)]
+		self.assertIn("Rain Fall_avg1", fieldnames)
+		self.assertNotIn("Sand_avg1", fieldnames)
+
+		# Cached until a survey is written
+		with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql:
+			self.assertEqual(get_columns(filters), get_columns(filters))
+		self.assertEqual(sql.call_count, 0)
+
+		frappe.get_doc(
+			{
+				"doctype": "Research Survey",
+				"project_title": TEST_TEMPLATE,
+				"table_bgyj": [{"indicator": "Sand", "dimension": "Soil", "variable1": 2, "variable2": 4}],
+			}
+		).insert()
+		fieldnames = [column["fieldname"] for column in get_columns(filters)]
+		self.assertIn("Sand_var1", fieldnames)
+		self.assertIn("Sand_avg1", fieldnames)
+
+	def test_accumulator_matches_response_rows(self):
+		filters = {"project_title": TEST_TEMPLATE}
+		accumulator = IndicatorAccumulator(track_variance=True)
+		rows = list(iter_response_rows(get_survey_responses(filters), ["Rain Fall", "Clay"], accumulator))
+
+		self.assertEqual(accumulator.response_count, len(rows))
+		for indicator in ("Rain Fall", "Clay"):
+			variable1 = [row[f"{indicator}_var1"] for row in rows]
+			variable2 = [row[f"{indicator}_var2"] for row in rows]
+			expected = (pvariance(variable1), pvariance(variable2))
+			for value, expected_value in zip(accumulator.variance(indicator), expected):
+				self.assertAlmostEqual(value, expected_value)
+
+		average1 = accumulator.summary_rows()[0]
+		self.assertAlmostEqual(average1["Clay_var1"], round(sum(row["Clay_var1"] for row in rows) / len(rows), 3))
+
+	def test_filters_scope_columns_and_rows(self):
+		filters = {"project_title": TEST_TEMPLATE, "dimension": "Water"}
+		fieldnames = [column["fieldname"] for column in get_columns(filters)]
+		self.assertIn("Rain Fall_var1", fieldnames)
+		self.assertNotIn("Clay_var1", fieldnames)
+
+		data = get_data(filters)
+		self.assertGreater(len(data), 3)
+		self.assertEqual(
+			{key for row in data for key in row},
+			{"response", "Rain Fall_var1", "Rain Fall_var2", "Rain Fall_avg1"},
+		)
+
+		before = {"project_title": TEST_TEMPLATE, "to_date": "2000-01-01"}
+		self.assertEqual(len(get_columns(before)), 1)
+		self.assertEqual(len(get_data(before)), 3)
@@ -0,0 +1,267 @@
+# Copyright (c) 2025, Ashish and contributors
+# For license information, please see license.txt
+
+from array import array
+
+import numpy as np
+
+from gisappv1.gisappv1.doctype.research_template.template_metadata import to_camel_case
+
+VARIABLE1 = 0
+VARIABLE2 = 1
+
+
+def round_values(values, digits=2):
+    """Round every element like Python's round() so the report keeps showing the same figures."""
+    values = np.asarray(values, dtype=float)
+    rounded = [round(value, digits) for value in values.ravel().tolist()]
+    return np.array(rounded, dtype=float).reshape(values.shape)
+
+
+class SurveyMatrix:
+    """
+    Dense survey x indicator matrix of the summed variable1/variable2 values
+
+    Row i holds survey `parents[i]` and column j holds the indicator whose
+    report fieldnames are `variable1<keys[j]>` / `variable2<keys[j]>`.
+    `values[i, j]` is the (variable1, variable2) pair and `present[i, j]`
+    tells whether the survey answered that indicator at all.
+    """
+
+    def __init__(self, parents, keys, values, present, parentfield=None, parenttype=None):
+        self.parents = parents
+        self.keys = keys
+        self.values = values
+        self.present = present
+        self.parentfield = parentfield
+        self.parenttype = parenttype
+        self.row_count = 0
+
+    @classmethod
+    def from_grouped_rows(cls, grouped_rows, column_key, parentfield=None, parenttype=None):
+        """
+        Build the matrix from (parent, indicator, variable1, variable2) rows
+
+        Rows are consumed one at a time into compact typed arrays, so an
+        iterator over an unbuffered cursor is never held in memory as a whole.
+
+        Args:
+            grouped_rows (iterable): Rows ordered by survey, as returned by get_grouped_survey_totals
+            column_key (callable): Maps an indicator name to its column key
+            parentfield (str): Table field of the surveys, copied into every survey row
+            parenttype (str): DocType of the surveys, copied into every survey row
+
+        Returns:
+            SurveyMatrix: Surveys and columns in order of first appearance
+        """
+        parent_index, key_index, column_keys = {}, {}, {}
+        parents, keys = [], []
+        row_positions, column_positions = array("q"), array("q")
+        variable1_values, variable2_values = array("d"), array("d")
+
+        for parent, indicator, variable1, variable2 in grouped_rows:
+            row = parent_index.get(parent)
+            if row is None:
+                row = parent_index[parent] = len(parents)
+                parents.append(parent)
+
+            key = column_keys.get(indicator)
+            if key is None:
+                key = column_keys[indicator] = column_key(indicator)
+
+            column = key_index.get(key)
+            if column is None:
+                column = key_index[key] = len(keys)
+                keys.append(key)
+
+            row_positions.append(row)
+            column_positions.append(column)
+            variable1_values.append(variable1)
+            variable2_values.append(variable2)
+
+        values = np.zeros((len(parents), len(keys), 2))
+        present = np.zeros((len(parents), len(keys)), dtype=bool)
+
+        if row_positions:
+            rows = np.frombuffer(row_positions, dtype=np.int64)
+            columns = np.frombuffer(column_positions, dtype=np.int64)
+            # Indicators that only differ in spacing share a column, so accumulate
+            np.add.at(values, (rows, columns, VARIABLE1), np.frombuffer(variable1_values))
+            np.add.at(values, (rows, columns, VARIABLE2), np.frombuffer(variable2_values))
+            present[rows, columns] = True
+
+        matrix = cls(parents, keys, values, present, parentfield, parenttype)
+        matrix.row_count = len(row_positions)
+        return matrix
+
+    def survey_rows(self):
+        """Build the per-survey report rows from the matrix."""
+        rows = []
+        values = self.values.tolist()
+
+        for i, parent in enumerate(self.parents):
+            row = {"parent": parent, "parentfield": self.parentfield, "parenttype": self.parenttype}
+
+            for j in np.flatnonzero(self.present[i]).tolist():
+                row["variable1" + self.keys[j]] = values[i][j][VARIABLE1]
+                row["variable2" + self.keys[j]] = values[i][j][VARIABLE2]
+
+            rows.append(row)
+
+        return rows
+
+    def summary(self):
+        """Column totals of every survey in the matrix."""
+        return SurveySummary(self.keys, self.values.sum(axis=0), len(self.parents))
+
+
+class SurveySummary:
+    """
+    Averages of a set of surveys, one entry per indicator column
+
+    `averages` holds the rounded variable1/variable2 averages shown in the
+    "Average of Varables" row, `indicator_averages` the mean of the two
+    ("Average of Each Indicator") and `overall_average` the mean over all
+    indicators (the dimension average row).
+    """
+
+    def __init__(self, keys, totals, survey_count):
+        if not survey_count:
+            keys, totals = [], np.zeros((0, 2))
+
+        self.keys = list(keys)
+        self.key_index = {key: j for j, key in enumerate(self.keys)}
+        self.survey_count = survey_count
+
+        totals = np.asarray(totals, dtype=float).reshape(len(self.keys), 2)
+        self.averages = round_values(totals / survey_count) if survey_count else totals
+        self.indicator_averages = self.averages.mean(axis=1)
+        self.overall_average = float(self.indicator_averages.mean()) if self.keys else None
+
+    @classmethod
+    def from_indicator_totals(cls, indicator_totals, survey_count, indicators_list):
+        """
+        Build the summary from per-indicator running sums, e.g. the Survey Indicator Rollups
+
+        Args:
+            indicator_totals (iterable): Rows of (indicator, sum_variable1, sum_variable2)
+            survey_count (int): Number of surveys the sums cover
+            indicators_list (list): Template indicators, their order is kept for the columns
+
+        Returns:
+            SurveySummary: Template indicators first, any other answered indicator after them by name
+        """
+        totals = {}
+        for indicator, sum_variable1, sum_variable2 in indicator_totals:
+            total = totals.setdefault(to_camel_case(indicator), [0.0, 0.0])
+            total[VARIABLE1] += sum_variable1
+            total[VARIABLE2] += sum_variable2
+
+        keys = []
+        for indicator in indicators_list:
+            key = indicator["key"]
+            if key in totals and key not in keys:
+                keys.append(key)
+        keys.extend(sorted(key for key in totals if key not in keys))
+
+        return cls(keys, [totals[key] for key in keys], survey_count)
+
+    def column_index(self, keys):
+        """Column position of each key, -1 when the surveys never answered it."""
+        return np.array([self.key_index.get(key, -1) for key in keys], dtype=int)
+
+    @staticmethod
+    def lookup(values, index):
+        """Pick values by column position, 0 for missing columns."""
+        if not len(index):
+            return np.zeros(0)
+        if not len(values):
+            return np.zeros(len(index))
+        return np.where(index >= 0, values[np.maximum(index, 0)], 0.0)
+
+    def dimension_average_values(self):
+        """The dimension average row keeps its value in the first indicator column only."""
+        values = np.zeros(len(self.keys))
+        if self.overall_average is not None:
+            values[0] = self.overall_average
+        return values
+
+    def average_rows(self, average_of_dimension_label):
+        """
+        Build the three summary rows appended below the survey rows
+
+        Args:
+            average_of_dimension_label (str): Label of the dimension average row
+
+        Returns:
+            list: "Average of Varables", "Average of Each Indicator" and dimension average rows
+        """
+        averages = {
+            "parent": "average",
+            "parentfield": "average",
+            "parenttype": "Research Survey",
+            "project_title": "Average of Varables",
+        }
+        averaged1 = {
+            "parent": "average1",
+            "parentfield": "average1",
+            "parenttype": "Research Survey",
+            "project_title": "Average of Each Indicator",
+        }
+
+        for key, (average1, average2), indicator_average in zip(
+            self.keys, self.averages.tolist(), self.indicator_averages.tolist()
+        ):
+            averages["variable1" + key] = average1
+            averages["variable2" + key] = average2
+            averaged1["variable1" + key] = indicator_average
+
+        averaged2 = {}
+        if self.keys:
+            averaged2 = {
+                "parent": "average2",
+                "parentfield": "average2",
+                "parenttype": "Research Survey",
+                "project_title": average_of_dimension_label,
+                "variable1" + self.keys[0]: self.overall_average,
+            }
+
+        return [averages, averaged1, averaged2]
+
+    def gwgi(self, indicators_list):
+        """
+        Weighted Ground Water Governance Index of the template indicators
+
+        Args:
+            indicators_list (list): Template indicators with indicator, dimension and weight
+
+        Returns:
+            tuple: (dimension names, dimension weights, dimension averages, GWGI value)
+        """
+        dimension_index, dimension_names, weights = {}, [], []
+        indicator_dimensions = []
+
+        for indicator in indicators_list:
+            position = dimension_index.get(indicator["dimension"])
+            if position is None:
+                position = dimension_index[indicator["dimension"]] = len(dimension_names)
+                dimension_names.append(indicator["dimension"])
+                weights.append(indicator["weight"] or 0)
+            indicator_dimensions.append(position)
+
+        # Spaces are dropped from the indicator name to find its column
+        index = self.column_index([indicator["indicator"].replace(" ", "") for indicator in indicators_list])
+        found = index >= 0
+        dimensions = np.asarray(indicator_dimensions, dtype=int)[found]
+        values = self.indicator_averages[index[found]] if found.any() else np.zeros(0)
+
+        totals = np.bincount(dimensions, weights=values, minlength=len(dimension_names))
+        counts = np.bincount(dimensions, minlength=len(dimension_names))
+        dimension_averages = np.divide(
+            totals, counts, out=np.zeros(len(dimension_names)), where=counts > 0
+        )
+
+        weights = np.asarray(weights, dtype=float)
+        gwgi_value = float((dimension_averages * (weights / 100)).sum())
+
+        return dimension_names, weights, dimension_averages, gwgi_value
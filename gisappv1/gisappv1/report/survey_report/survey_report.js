@@ -13,28 +13,16 @@ frappe.query_reports["Survey Report"] = {
             "on_change": function() {
                 let selected_template = frappe.query_report.get_filter_value('project_title');
                 if (selected_template) {
-                    // When project_title changes, fetch dimensions for the dimensions filter
+                    // When project_title changes, fetch the cached dimension options of the template
                     frappe.call({
-                        method: "frappe.client.get_list",
+                        method: "gisappv1.gisappv1.doctype.research_template.template_metadata.get_report_filter_options",
                         args: {
-                            doctype: "Dimensions",
-                            filters: {
-                                parent: selected_template
-                            },
-                            fields: ["dimensions"],
-                            parent: "Research Template"
+                            project_title: selected_template
                         },
                         callback: function(response) {
                             if(response.message) {
-                                // Get unique dimensions
-                                let options = ["All Indicators"];
-                            
-                                // Get unique dimensions
-                                let dimensions = response.message.map(d => d.dimensions);
-                                let unique_dimensions = [...new Set(dimensions)];
-
-                                // Combine empty option with unique dimensions
-                                options = options.concat(unique_dimensions);
+                                // "All Indicators" followed by the unique template dimensions
+                                let options = response.message.dimensions;
                                 
                                 // Update the dimensions filter options
                                 frappe.query_report.get_filter('dimension').df.options = options;
@@ -75,6 +63,21 @@ frappe.query_reports["Survey Report"] = {
                     frappe.query_report.refresh();
                 }
             }
+        },
+        {
+            "fieldname": "page_length",
+            "label": __("Surveys per Page"),
+            "fieldtype": "Select",
+            "options": ["", "100", "500", "1000", "5000"],  // Empty shows every survey
+            "reqd": 0
+        },
+        {
+            "fieldname": "page",
+            "label": __("Page"),
+            "fieldtype": "Int",
+            "default": 1,
+            "depends_on": "eval:doc.page_length",
+            "reqd": 0
         }
     ],
     
@@ -321,12 +324,90 @@ frappe.query_reports["Survey Report"] = {
         }
     },
 
+    // Download an exported PDF through get_pdf_file
+    "download_pdf": function(file_name, report_name, extension) {
+        var a = document.createElement('a');
+        a.href = frappe.urllib.get_full_url("/api/method/gisappv1.gisappv1.report.survey_report.survey_report.get_pdf_file?file_name=" + encodeURIComponent(file_name));
+        a.download = report_name + (extension || '.pdf');
+        document.body.appendChild(a);
+        a.click();
+        document.body.removeChild(a);
+
+        frappe.show_alert({
+            message: __("PDF downloaded successfully"),
+            indicator: 'green'
+        });
+    },
+
+    // Download the survey x indicator pivot through survey_report_download
+    "download_spreadsheet": function(method) {
+        const filters = frappe.query_report.get_filter_values();
+        if (!filters.project_title) {
+            frappe.msgprint(__("Please select a Research Template"));
+            return;
+        }
+
+        window.open(frappe.urllib.get_full_url(
+            "/api/method/gisappv1.gisappv1.report.survey_report.survey_report_download." + method
+            + "?filters=" + encodeURIComponent(JSON.stringify(filters))
+        ));
+    },
+
     // In the onload function, replace the chart container creation with this:
     "onload": function(report) {
         console.log("Report loaded, initializing chart");
         
         // Store report reference in the frappe.query_reports object for access in other functions
         const self = frappe.query_reports["Survey Report"];
+
+        // Heavy templates are prepared by a queue worker, follow its progress and load the result when it is done
+        frappe.realtime.off("survey_report_progress");
+        frappe.realtime.on("survey_report_progress", function(data) {
+            if (data.done) {
+                frappe.hide_progress();
+                if (data.failed) {
+                    frappe.msgprint(data.description);
+                } else {
+                    frappe.query_report.refresh();
+                }
+                return;
+            }
+            frappe.show_progress(__("Survey Report"), data.progress, 100, data.description);
+        });
+
+        // PDF exports run in a queue worker, download the file as soon as it is ready
+        frappe.realtime.off("survey_report_pdf");
+        frappe.realtime.on("survey_report_pdf", function(data) {
+            if (data.failed) {
+                frappe.msgprint(data.message);
+                return;
+            }
+
+            self.download_pdf(data.file_name, data.report_name);
+        });
+
+        // Bulk exports report every template as it is done, the last event carries the zip of all the PDFs
+        frappe.realtime.off("survey_report_bulk_pdf");
+        frappe.realtime.on("survey_report_bulk_pdf", function(data) {
+            if (!data.done) {
+                frappe.show_progress(__("Exporting PDFs"), data.progress, 100, data.description);
+                return;
+            }
+
+            frappe.hide_progress();
+            if (data.failed) {
+                frappe.msgprint(data.message);
+                return;
+            }
+
+            const failed = data.timings.filter(function(timing) { return !timing.file_name; });
+            if (failed.length) {
+                frappe.msgprint(__("These templates could not be exported: {0}", [
+                    failed.map(function(timing) { return timing.template; }).join(", ")
+                ]));
+            }
+            self.download_pdf(data.file_name, "Survey Reports", ".zip");
+        });
         
         // Fetch available Research Templates for dropdown (unchanged)
         frappe.call({
@@ -448,36 +529,22 @@ frappe.query_reports["Survey Report"] = {
                         }
                     }
 
-                    // Capture the current chart as an image
-                    const canvas = document.getElementById("radarChart");
-                    let chartImage = null;
-                    if (canvas) {
-                        // Convert canvas to base64 image
-                        chartImage = canvas.toDataURL("image/png");
-                    }
-
-                    // Generate PDF with the report data
+                    // The server draws the charts itself, no image is uploaded
+                    // Queue the PDF, the survey_report_pdf event downloads it when it is ready
                     frappe.call({
-                        method: "gisappv1.gisappv1.report.survey_report.survey_report.export_to_pdf",
+                        method: "gisappv1.gisappv1.report.survey_report.survey_report_export.enqueue_pdf_export",
                         args: {
                             filters: frappe.query_report.get_filter_values(),
-                            report_name: reportTitle,
-                            chart_image: chartImage
+                            report_name: reportTitle
                         },
                         callback: function(r) {
-                            if (r.message) {
-                                // Replace the window.open with a direct download approach
-                                var a = document.createElement('a');
-                                a.href = frappe.urllib.get_full_url("/api/method/gisappv1.gisappv1.report.survey_report.survey_report.get_pdf_file?file_name=" + r.message);
-                                // a.href = "/api/method/gisappv1.gisappv1.report.survey_report.survey_report.get_pdf_file?file_name=" + encodeURIComponent(r.message);
-                                a.download = reportTitle + '.pdf';
-                                document.body.appendChild(a);
-                                a.click();
-                                document.body.removeChild(a);
-                                
+                            if (r.message && r.message.file_name) {
+                                // The same PDF was exported before
+                                frappe.query_reports["Survey Report"].download_pdf(r.message.file_name, reportTitle);
+                            } else if (r.message) {
                                 frappe.show_alert({
-                                    message: __("PDF downloaded successfully"),
-                                    indicator: 'green'
+                                    message: __("The PDF is being generated and will download when it is ready"),
+                                    indicator: 'blue'
                                 });
                             } else {
                                 frappe.throw(__("PDF export failed"));
@@ -487,6 +554,33 @@ frappe.query_reports["Survey Report"] = {
 
                 });
 
+                // Every template at once, rendered by a pool in a queue worker
+                report.page.add_inner_button("Export All Templates to PDF", function() {
+                    frappe.confirm(__("Export the Survey Report PDF of every Research Template?"), function() {
+                        frappe.call({
+                            method: "gisappv1.gisappv1.report.survey_report.survey_report_bulk.enqueue_bulk_pdf_export",
+                            // The dimension only applies to the selected template, the others are exported whole
+                            args: {
+                                filters: frappe.query_report.get_filter_values()
+                            },
+                            callback: function(r) {
+                                frappe.show_alert({
+                                    message: __("Exporting {0} templates, the zip will download when it is ready", [r.message.templates]),
+                                    indicator: 'blue'
+                                });
+                            }
+                        });
+                    });
+                });
+
+                // The pivot is streamed by the server, the browser only follows the link
+                report.page.add_inner_button("CSV", function() {
+                    frappe.query_reports["Survey Report"].download_spreadsheet("download_csv");
+                }, "Download");
+                report.page.add_inner_button("Excel", function() {
+                    frappe.query_reports["Survey Report"].download_spreadsheet("download_xlsx");
+                }, "Download");
+
                 
             }, function(error) {
                 console.error("Failed to load Chart.js:", error);
@@ -1,5 +1,42 @@
 # Add this new method to your Python file to handle direct PDF download
 import frappe
+from frappe import _
+from frappe.utils import cint
+
+from gisappv1 import report_pdf
+from gisappv1.profiling import phase, report_profile
+from gisappv1.gisappv1.doctype.research_template.template_metadata import (
+    get_report_columns,
+    get_template_indicators,
+    get_template_meta,
+    to_camel_case,
+)
+from gisappv1.gisappv1.doctype.survey_indicator_rollup.survey_indicator_rollup import (
+    get_indicator_totals,
+)
+from gisappv1.gisappv1.report.survey_report.survey_matrix import (
+    VARIABLE1,
+    VARIABLE2,
+    SurveyMatrix,
+    SurveySummary,
+)
+from gisappv1.gisappv1.report.survey_report.survey_report_background import (
+    computed_in_place,
+    get_background_result,
+    get_pending_result,
+    is_pending_result,
+    should_run_in_background,
+)
+from gisappv1.gisappv1.report.survey_report.survey_report_cache import get_cached_result
+from gisappv1.gisappv1.report.survey_report.survey_report_chart import get_chart_svgs
+from gisappv1.gisappv1.report.survey_report.survey_report_export import get_pdf_export, send_export_file
+
+# Upper bound of surveys returned per page in windowed mode
+MAX_PAGE_LENGTH = 5000
+
+SURVEY_DOCTYPE = "Research Survey"
+SURVEY_TABLE_FIELD = "table_bgyj"
+
 @frappe.whitelist()
 def get_pdf_file(file_name):
     """
@@ -9,18 +46,9 @@ def get_pdf_file(file_name):
         file_name (str): Name of the file document
         
     Returns:
-        Response: File download response
+        Response: File download response, streamed from disk with Range support
     """
-    from frappe.utils.response import download_file
-    from frappe.utils.file_manager import get_file
-    
-    file_path = frappe.get_doc("File", file_name)
-    file_content = get_file(file_name)
-    
-    return download_file(
-        file_content[1],
-        file_path.file_name
-    )
+    return send_export_file(file_name)
 
 # Update the export_to_pdf function to fix the table scrolling issue
 @frappe.whitelist()
@@ -31,367 +59,272 @@ def export_to_pdf(filters, report_name, chart_image=None, html_data=None):
     Args:
         filters (dict): Filter values for the report
         report_name (str): Name for the PDF report
-        chart_image (str): Base64 encoded image of the chart
+        chart_image (str): Base64 encoded image of the chart, only used when the report has no chart data
         html_data (str): HTML of the report data table
         
     Returns:
         str: Name of the generated PDF file
     """
-    import base64
-    from datetime import datetime
-    from frappe.utils.pdf import get_pdf
-    from frappe.utils import get_site_path, get_files_path
-    
     # Convert filters from string to dict if needed
     if isinstance(filters, str):
         import json
         filters = json.loads(filters)
-    
-    # Re-run the report to get the data
-    columns, data = execute(filters)[:2]
-    
-    # Generate HTML for the PDF
-    html_content = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <title>{0}</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-            .report-header {{ text-align: center; margin-bottom: 20px; }}
-            .report-title {{ font-size: 18px; font-weight: bold; }}
-            .report-date {{ font-size: 12px; color: #666; }}
-            .chart-container {{ text-align: center; margin: 20px 0; }}
-            .chart-container img {{ max-width: 100%; height: auto; }}
-            .table-container {{ overflow: visible; width: 100%; }}
-            table {{ width: 100%; border-collapse: collapse; margin-top: 20px; page-break-inside: auto; }}
-            thead {{ display: table-header-group; }}
-            tr {{ page-break-inside: avoid; page-break-after: auto; }}
-            th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; font-size: 10px; }}
-            th {{ background-color: #f2f2f2; font-weight: bold; }}
-            tr:nth-child(even) {{ background-color: #f9f9f9; }}
-            @page {{ size: landscape; margin: 1cm; }}
-        </style>
-    </head>
-    <body>
-        <div class="report-header">
-            <div class="report-title">{0}</div>
-            <div class="report-date">Generated on: {1}</div>
-        </div>
-    """.format(report_name, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    
-    # Add chart image if provided
-    if chart_image:
-        # Remove the data:image/png;base64, prefix if present
-        if "base64," in chart_image:
-            chart_image = chart_image.split("base64,")[1]
-        
-        html_content += """
-        <div class="chart-container">
-            <h3>Radar Chart Visualization</h3>
-            <img src="data:image/png;base64,{0}" alt="Survey Chart">
-        </div>
-        """.format(chart_image)
-    
-    # Generate table with scrollable container
-    html_content += '<h3>Detailed Data</h3><div class="table-container"><table><thead><tr>'
-    
-    # Add table headers - only include essential columns to fit in PDF
-    visible_columns = []
-    for col in columns:
-        # Skip columns that start with 'parent' to reduce table width
-        if not col.get("fieldname", "").startswith("parent"):
-            visible_columns.append(col)
-            html_content += "<th>{0}</th>".format(col.get("label", ""))
-    
-    html_content += "</tr></thead><tbody>"
-    
-    # Add table rows
-    for row in data:
-        html_content += "<tr>"
-        for col in visible_columns:
-            field_name = col.get("fieldname", "")
-            cell_value = row.get(field_name, "")
-            
-            # Format float values
-            if isinstance(cell_value, float):
-                cell_value = "{:.2f}".format(cell_value)
-            
-            html_content += "<td>{0}</td>".format(cell_value)
-        html_content += "</tr>"
-    
-    html_content += "</tbody></table></div>"
-    
-    # Close HTML
-    html_content += """
-    </body>
-    </html>
-    """
-    
-    # Generate PDF with landscape orientation and adjusted margins
-    pdf_options = {
-        "orientation": "Landscape",
-        "page-size": "A4",
-        "margin-top": "10mm",
-        "margin-right": "10mm",
-        "margin-bottom": "10mm",
-        "margin-left": "10mm",
-        "print-media-type": True,
-        "dpi": 300
-    }
-    
-    pdf_data = get_pdf(html_content, options=pdf_options)
-    
-    # Save PDF to a file
-    file_name = "{0}_{1}.pdf".format(
-        report_name.replace(" ", "_").lower(),
-        datetime.now().strftime("%Y%m%d_%H%M%S")
-    )
-    
-    # Create a File record
-    file_doc = frappe.get_doc({
-        "doctype": "File",
-        "file_name": file_name,
-        "content": pdf_data,
-        "is_private": 1,
-    })
-    file_doc.insert(ignore_permissions=True)
-    
+
+    # Reuses the File of an identical earlier export
+    return get_pdf_export(filters, report_name, chart_image)
+
+
+def make_pdf_file(filters, report_name, chart_image=None, file_name=None):
+    """Render the report to PDF and save it as a private File, shared by the direct and the queued export."""
+    with report_profile("Survey Report PDF", filters):
+        # Re-run the report to get the data
+        with phase("execute"):
+            # A PDF of the pending placeholder would have an empty table
+            with computed_in_place():
+                result = execute(filters)
+            # Never write, let alone reuse, a PDF without the rows
+            if is_pending_result(result):
+                frappe.throw(_("The report is still being prepared, export it again when it is ready"))
+            columns, data = result[:2]
+
+        with phase("chart"):
+            # Drawn from the report's own chart data, an uploaded image is only used when there is none
+            chart = result[3] if len(result) > 3 else None
+            charts = get_chart_svgs(filters, chart, report_name) if chart else None
+
+        with phase("pdf_render") as pdf_phase:
+            # Long tables are rendered in parallel chunks and merged
+            pdf_data = report_pdf.get_report_pdf(report_name, columns, data, chart_image, charts=charts)
+            pdf_phase.rows = len(data)
+
+        with phase("file"):
+            # Create a File record
+            file_doc = frappe.get_doc({
+                "doctype": "File",
+                "file_name": file_name or report_pdf.get_pdf_file_name(report_name),
+                "content": pdf_data,
+                "is_private": 1,
+            })
+            file_doc.insert(ignore_permissions=True)
+
     return file_doc.name
 
 
-def to_camel_case(snake_str):
-    """Convert snake_case or space-separated string to camelCase."""
-    components = snake_str.split("_")
-    camel_case_str = components[0] + "".join(x.title() for x in components[1:])
-    # Ensure there are no spaces or unexpected characters
-    return camel_case_str.replace(" ", "")
+def get_grouped_survey_totals(research_template, filter_dimension=None, parents=None):
+    """
+    Sum variable1/variable2 per survey and indicator inside the database
 
-def execute(filters=None):
-    columns, data = [], []
+    The rows are returned as an iterator so they can be streamed from an
+    unbuffered cursor, call it inside `frappe.db.unbuffered_cursor()` and
+    consume the rows before running any other query.
 
-    # Check if project_title filter exists
-    if not filters or not filters.get("project_title"):
-        return columns, data
-    
-    # Get the selected Research Template
-    research_template = filters.get("project_title")
-    # Get the selected Dimension
-    filter_dimension = filters.get("dimension")
-    # Get the GI Selection
-    filter_gi = filters.get("gwgi")
+    Args:
+        research_template (str): Name of the Research Template
+        filter_dimension (str): Dimension to restrict to, "All Indicators" for none
+        parents (list): Only these surveys, all surveys of the template when None
 
-    query_to_get_column_data = """
-        SELECT child.*
-        FROM `tabResearch Template` AS parent
-        JOIN `tabIndicators` AS child ON child.parent = parent.name
-        WHERE parent.name = %s
+    Returns:
+        iterator: Rows of (parent, indicator, variable1, variable2) ordered by survey
+            and by the position of the indicator in the survey
     """
-    
-    # Add dimension filter if provided
-    col_parameters = [research_template]
+    if parents is not None and not parents:
+        return iter(())
+
+    query = """
+        SELECT child.parent, child.indicator,
+            IFNULL(SUM(child.variable1), 0) AS variable1,
+            IFNULL(SUM(child.variable2), 0) AS variable2
+        FROM `tabResearch Survey` AS parent
+        JOIN `tabData Entry Table` AS child ON child.parent = parent.name
+        WHERE parent.project_title = %s AND child.parenttype = %s AND child.parentfield = %s
+    """
+
+    parameters = [research_template, SURVEY_DOCTYPE, SURVEY_TABLE_FIELD]
+
     if filter_dimension != "All Indicators":
-        query_to_get_column_data += " AND child.dimension = %s"
-        col_parameters.append(filter_dimension)
+        query += " AND child.dimension = %s"
+        parameters.append(filter_dimension)
 
-    # Execute SQL Query and fetch results
-    query_to_get_column_data_result = frappe.db.sql(
-        query_to_get_column_data, col_parameters, as_dict=True
-    )
+    if parents is not None:
+        query += " AND child.parent IN %s"
+        parameters.append(tuple(parents))
 
-    indicators_list = []
-    
-    project_column = {
-        "fieldname": "project_title",
-        "label": "Project",
-        "fieldtype": "Data",
-        "width": 150,
-    }
-    
-    columns.append(project_column)
-
-    # Add indicators and dimensions to indicators_list
-    for item in query_to_get_column_data_result:
-        indicator_obj = {
-            "indicator": item["indicators"],
-            "dimension": item["dimension"],
-            "weight": item["weight_dimension"]
-        }
-        indicators_list.append(indicator_obj)
+    query += """
+        GROUP BY child.parent, child.indicator
+        ORDER BY child.parent, MIN(child.idx)
+    """
 
-    for indicator in indicators_list:
-        camel_case_indicator = to_camel_case(indicator["indicator"])
-        
-        # Create variable1 and variable2 for each indicator
-        variable1 = {
-            "fieldname": "variable1" + camel_case_indicator,
-            "label": indicator["indicator"] + " Variable 1",
-            "fieldtype": "Float",
-            "width": 150,
-        }
-        variable2 = {
-            "fieldname": "variable2" + camel_case_indicator,
-            "label": indicator["indicator"] + " Variable 2",
-            "fieldtype": "Float",
-            "width": 200,
-        }
+    return frappe.db.sql(query, parameters, as_iterator=True)
 
-        # Append variable1 and variable2 to columns
-        columns.append(variable1)
-        columns.append(variable2)
+def get_survey_window(research_template, filter_dimension, page_length, start=0, after=None):
+    """
+    Names of one page of surveys, in the same order as the report rows
 
-    # Using parameters with %s placeholder correctly
-    base_query = """
-        SELECT child.* 
+    Args:
+        research_template (str): Name of the Research Template
+        filter_dimension (str): Dimension to restrict to, "All Indicators" for none
+        page_length (int): Number of surveys in the page
+        start (int): Offset of the page, ignored when `after` is given
+        after (str): Keyset cursor, the last survey of the previous page
+
+    Returns:
+        list: Survey names
+    """
+    query = """
+        SELECT DISTINCT child.parent
         FROM `tabResearch Survey` AS parent
         JOIN `tabData Entry Table` AS child ON child.parent = parent.name
-        WHERE parent.project_title = %s
+        WHERE parent.project_title = %s AND child.parenttype = %s AND child.parentfield = %s
     """
 
-    row_parameters = [research_template]
+    # Same rows as get_grouped_survey_totals, so every survey of a page has totals
+    parameters = [research_template, SURVEY_DOCTYPE, SURVEY_TABLE_FIELD]
 
     if filter_dimension != "All Indicators":
-        base_query = base_query + " AND child.dimension = %s"
-        row_parameters.append(filter_dimension)
+        query += " AND child.dimension = %s"
+        parameters.append(filter_dimension)
 
-    query_to_get_row_data_result = frappe.db.sql(base_query, row_parameters, as_dict=True)
+    if after:
+        query += " AND child.parent > %s"
+        parameters.append(after)
+        start = 0
 
-    grouped_data = {}
+    query += " ORDER BY child.parent LIMIT %s OFFSET %s"
+    parameters.extend([page_length, start])
 
-    for obj in query_to_get_row_data_result:
-        parent = obj["parent"]
-        indicator_camel_case = to_camel_case(obj["indicator"])
+    return frappe.db.sql_list(query, parameters)
 
-        # Ensure the necessary keys exist in the grouped data
-        key1 = f"variable1{indicator_camel_case}"
-        key2 = f"variable2{indicator_camel_case}"
+def get_summary(research_template, filter_dimension, indicators_list):
+    """
+    Build the averages of a template from the maintained Survey Indicator Rollups
 
-        if parent not in grouped_data:
-            grouped_data[parent] = {
-                "parent": parent,
-                "parentfield": obj["parentfield"],
-                "parenttype": obj["parenttype"],
-            }
+    Only reads one row per indicator, so it does not grow with the number of responses.
 
-        # Initialize keys if they don't exist
-        if key1 not in grouped_data[parent]:
-            grouped_data[parent][key1] = 0
-        if key2 not in grouped_data[parent]:
-            grouped_data[parent][key2] = 0
+    Args:
+        research_template (str): Name of the Research Template
+        filter_dimension (str): Dimension to restrict to, "All Indicators" for none
+        indicators_list (list): Template indicators, their order is kept for the columns
 
-        # Assign values without using +=
-        grouped_data[parent][key1] = grouped_data[parent][key1] + obj["variable1"]
-        grouped_data[parent][key2] = grouped_data[parent][key2] + obj["variable2"]
+    Returns:
+        SurveySummary: Averages of every survey of the template
+    """
+    survey_count, indicator_totals = get_indicator_totals(research_template, filter_dimension)
+    return SurveySummary.from_indicator_totals(indicator_totals, survey_count, indicators_list)
 
-    # Convert the grouped data back to a list
-    data = list(grouped_data.values())
-    
-    # Initialize a dictionary to hold the sums
-    sums = {}
-    count = len(data)
-
-    # Iterate through each object in the data list
-    for obj in data:
-        for key, value in obj.items():
-            if key.startswith('variable'):
-                # Initialize the sum for the variable if it doesn't exist
-                if key not in sums:
-                    sums[key] = 0
-                # Add the value to the sum using explicit assignment
-                sums[key] = sums[key] + value
-
-    # Create a new dictionary to hold the averages
-    averages = {'parent': 'average', 'parentfield': 'average', 'parenttype': 'Research Survey', 'project_title': "Average of Varables"}
-
-    # Calculate the average for each variable
-    for key in sums:
-        averages[key] = round(sums[key] / count, 2)
-
-    # Append the averages dictionary to the data list
-    data.append(averages)
-    
-    average1_initial_data = data[-1]
-    
-    # Create a new object to hold the averages
-    averaged1 = {'parent': 'average1', 'parentfield': 'average1', 'parenttype': 'Research Survey', 'project_title': "Average of Each Indicator"}
-    
-    for key in average1_initial_data:
-        if key.startswith('variable1'):
-            # Create the corresponding variable2 key
-            variable2_key = key.replace('variable1', 'variable2')
-            
-            # Calculate the average of variable1 and variable2
-            if variable2_key in average1_initial_data:
-                average_value = (average1_initial_data[key] + average1_initial_data[variable2_key]) / 2
-                
-                # Store the average in variable1
-                averaged1[key] = average_value
-    
-    data.append(averaged1)
-    
-    # Initialized total sum data
-    average2_initial_data = data[-1]
-    
-    # Initialize a variable to hold the total sum
-    total_sum = 0
-    count = 0
-    first_float_key = None
-
-    # Loop through the dictionary
-    for key, value in average2_initial_data.items():
-        # Check if the value is a float
-        if isinstance(value, float):
-            total_sum += value
-            count += 1
-            # Capture the first float variable key
-            if first_float_key is None:
-                first_float_key = key
-
-    # Calculate the average
-    if count > 0:
-        average = total_sum / count
-    else:
-        average = 0  # Avoid division by zero if there are no float values
+def execute(filters=None):
+    # Check if project_title filter exists
+    if not filters or not filters.get("project_title"):
+        return [], []
+
+    with report_profile("Survey Report", filters):
+        # Heavy templates are prepared by a queue worker instead of blocking this request
+        if should_run_in_background(filters):
+            with phase("background") as background_phase:
+                result = get_background_result(filters)
+                if result is None:
+                    meta = get_template_meta(filters.get("project_title"))
+                    result = get_pending_result(filters, get_report_columns(meta, filters.get("dimension")))
+                background_phase.rows = len(result[1])
+            return result
+
+        # Dashboards ask for the same filters over and over, serve them from the cache
+        with phase("execute") as execute_phase:
+            result = get_cached_result(filters, get_report_result)
+            execute_phase.rows = len(result[1])
+
+    return result
+
+def get_report_result(filters, progress=None):
+    """
+    Build the report
 
-        # Add a dynamic average label based on dimension filter
-    if filter_dimension == "All Indicators":
-        average_of_dimension_label = "Average of All Dimension"
-    elif filter_dimension :
-        average_of_dimension_label = f"Average of {filter_dimension} Indicators"
-    else:
-        average_of_dimension_label = "Average of All Indicators"
+    Args:
+        filters (dict): Report filters
+        progress (callable): Called with (percent, description) as the phases start, used by background runs
 
-    averaged2 ={}
-    
-    # Store the average in the first float variable if it exists
-    if first_float_key is not None:
-        averaged2 = {
-            'parent': 'average2',
-            'parentfield': 'average2',
-            'parenttype': 'Research Survey',
-            'project_title': average_of_dimension_label,
-            first_float_key: average  # Append the average value here
-        }
-    
-    data.append(averaged2)
-    print(data)
+    Returns:
+        tuple: (columns, data, message, chart)
+    """
+    progress = progress or (lambda percent, description: None)
 
-    chart_data = []
-    chart_data.append(data[-3])
-    chart_data.append(data[-2])
-    chart_data.append(data[-1])
-    
+    # Get the selected Research Template
+    research_template = filters.get("project_title")
+    # Get the selected Dimension
+    filter_dimension = filters.get("dimension")
+    # Get the GI Selection
+    filter_gi = filters.get("gwgi")
 
+    # Indicators, weights and column keys come from the cached template metadata
+    progress(5, _("Loading template indicators"))
+    with phase("get_columns") as columns_phase:
+        meta = get_template_meta(research_template)
+        indicators_list = get_template_indicators(meta, filter_dimension)
+        columns = get_report_columns(meta, filter_dimension)
+        columns_phase.rows = len(columns)
+
+    progress(10, _("Adding up survey responses"))
+    with phase("sql") as sql_phase:
+        # In windowed mode only one page of surveys is grouped, the summary still covers all of them
+        page_length = min(cint(filters.get("page_length")), MAX_PAGE_LENGTH)
+        parents = None
+        if page_length > 0:
+            start = (max(cint(filters.get("page")), 1) - 1) * page_length
+            parents = get_survey_window(
+                research_template, filter_dimension, page_length, start, filters.get("after")
+            )
+
+        # Let the database add up the variables, one row per survey and indicator, and
+        # group them into the matrix while they stream in instead of holding the result set
+        template_keys = {indicator["indicator"]: indicator["key"] for indicator in indicators_list}
+        with frappe.db.unbuffered_cursor():
+            matrix = SurveyMatrix.from_grouped_rows(
+                get_grouped_survey_totals(research_template, filter_dimension, parents),
+                lambda indicator: template_keys.get(indicator) or to_camel_case(indicator),
+                SURVEY_TABLE_FIELD,
+                SURVEY_DOCTYPE,
+            )
+        sql_phase.rows = matrix.row_count
+
+    progress(70, _("Building report rows"))
+    with phase("grouping") as grouping_phase:
+        summary = get_summary(research_template, filter_dimension, indicators_list)
+
+        # Rows are only materialised as dicts once all the math is done on the matrix
+        data = matrix.survey_rows()
+        data.extend(summary.average_rows(get_average_label(filter_dimension)))
+        grouping_phase.rows = len(data)
+
+    progress(90, _("Creating chart"))
     if filter_gi == "GWGI":
-        chart = create_gwgi_chart(filters,indicators_list, data[-2])
+        with phase("create_gwgi_chart") as chart_phase:
+            chart = create_gwgi_chart(filters, indicators_list, summary)
+            chart_phase.rows = len(chart["data"]["labels"])
     else:
-        chart = create_chart(filters, indicators_list, chart_data)
+        with phase("create_chart") as chart_phase:
+            chart = create_chart(filters, indicators_list, summary)
+            chart_phase.rows = len(chart["data"]["labels"])
         # chart = create_radar_chart(filters, indicators_list, chart_data)
+
+    message = None
+    if parents is not None:
+        message = get_window_message(parents, summary.survey_count)
         
-    return columns, data, None, chart
+    return columns, data, message, chart
+
+def get_average_label(filter_dimension):
+    # Add a dynamic average label based on dimension filter
+    if filter_dimension == "All Indicators":
+        return "Average of All Dimension"
+    elif filter_dimension:
+        return f"Average of {filter_dimension} Indicators"
+    return "Average of All Indicators"
+
+def get_window_message(parents, survey_count):
+    if not parents:
+        return _("No more surveys, {0} in total").format(survey_count)
+    return _("Showing surveys {0} to {1} of {2}").format(parents[0], parents[-1], survey_count)
 
-def create_chart(filters, indicators_list, chart_data):
+def create_chart(filters, indicators_list, summary):
     # Safely get the dimension filter value
     filter_dimension = None
     if filters and isinstance(filters, dict):
@@ -412,29 +345,13 @@ def create_chart(filters, indicators_list, chart_data):
 
     datasets = []
 
-    # Create datasets for each indicator
-    variable1_values = []
-    variable2_values = []
-    average_values = []
-    overall_average_values = []
-    
-    for field in indicators_list:
-        # Extracting values from the first object (chart_data[0])
-        value1 = chart_data[0].get(f'variable1{to_camel_case(field["indicator"])}', 0)
-        value2 = chart_data[0].get(f'variable2{to_camel_case(field["indicator"])}', 0)
-        
-        # Extracting average values from the second object (chart_data[1])
-        avg_value = chart_data[1].get(f'variable1{to_camel_case(field["indicator"])}', 0)
+    # Column of every template indicator in the summary, missing ones read as 0
+    index = summary.column_index([field["key"] for field in indicators_list])
 
-        # Append values to respective lists
-        variable1_values.append(value1)
-        variable2_values.append(value2)
-        average_values.append(avg_value)
-
-    # Calculate overall average from the third object (chart_data[2])
-    for field in indicators_list:
-        overall_avg_value = chart_data[2].get(f'variable1{to_camel_case(field["indicator"])}', 0)
-        overall_average_values.append(overall_avg_value)
+    variable1_values = summary.lookup(summary.averages[:, VARIABLE1], index).tolist()
+    variable2_values = summary.lookup(summary.averages[:, VARIABLE2], index).tolist()
+    average_values = summary.lookup(summary.indicator_averages, index).tolist()
+    overall_average_values = summary.lookup(summary.dimension_average_values(), index)
 
     # Create datasets
     datasets.append({
@@ -453,7 +370,7 @@ def create_chart(filters, indicators_list, chart_data):
     # Add a separate dataset for the overall average
     datasets.append({
         "name": average_label,
-        "values": [0] * len(indicators_list) + [sum(overall_average_values)]  # Zeros for indicators and overall average at the end
+        "values": [0] * len(indicators_list) + [float(overall_average_values.sum())]  # Zeros for indicators and overall average at the end
     })
 
     # Creating the chart structure
@@ -469,44 +386,13 @@ def create_chart(filters, indicators_list, chart_data):
 
     return chart
 
-def create_gwgi_chart(filters, indicators_list, chart_data):
-    # Group indicators by dimension
-    dimensions = {}
-    for ind in indicators_list:
-        dim_name = ind['dimension']
-        if dim_name not in dimensions:
-            dimensions[dim_name] = {
-                'indicators': [],
-                'weight': ind['weight']
-            }
-        dimensions[dim_name]['indicators'].append(ind['indicator'])
-    
-    # Calculate average for each dimension
-    dimension_averages = {}
-    for dim_name, dim_data in dimensions.items():
-        total = 0
-        count = 0
-        for indicator in dim_data['indicators']:
-            # Handle the special case of "Srishant Dai" vs "SrishantDai" in the variable name
-            var_name = f"variable1{indicator.replace(' ', '')}"
-            if var_name in chart_data:
-                total += chart_data[var_name]
-                count += 1
-        
-        if count > 0:
-            dimension_averages[dim_name] = total / count
-        else:
-            dimension_averages[dim_name] = 0
-    
-    # Calculate GWGI value
-    gwgi_value = 0
-    for dim_name, avg in dimension_averages.items():
-        weight = dimensions[dim_name]['weight'] / 100  # Convert weight to decimal
-        gwgi_value += avg * weight
-    
+def create_gwgi_chart(filters, indicators_list, summary):
+    # Dimension averages and the weighted GWGI value, computed on the summary arrays
+    dimension_names, _weights, dimension_averages, gwgi_value = summary.gwgi(indicators_list)
+
     # Prepare data for the chart
-    labels = list(dimension_averages.keys())
-    values = list(dimension_averages.values())
+    labels = list(dimension_names)
+    values = dimension_averages.tolist()
     
     # Add the GWGI value to the chart
     labels.append("GWGI")
@@ -537,22 +423,4 @@ def create_gwgi_chart(filters, indicators_list, chart_data):
         # Removed tooltipOptions with JavaScript functions
     }
 
-    
-    # Create a summary with details
-    dimension_details = []
-    for dim_name, avg in dimension_averages.items():
-        weight = dimensions[dim_name]['weight']
-        weighted_value = avg * (weight / 100)
-        dimension_details.append({
-            "dimension": dim_name,
-            "average": round(avg, 2),
-            "weight": weight,
-            "weighted_value": round(weighted_value, 2)
-        })
-    
-    summary = {
-        "dimension_averages": dimension_details,
-        "gwgi_value": round(gwgi_value, 2)
-    }
-    
-    return chart 
\ No newline at end of file
+    return chart
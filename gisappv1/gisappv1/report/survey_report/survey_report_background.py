@@ -0,0 +1,146 @@
+# Copyright (c) 2025, Ashish and contributors
+# For license information, please see license.txt
+
+import json
+import zlib
+from contextlib import contextmanager
+
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+from gisappv1.gisappv1.doctype.survey_indicator_rollup.survey_indicator_rollup import get_entry_count
+from gisappv1.gisappv1.report.survey_report.survey_report_cache import get_cache_key
+
+# Templates with more child rows than this are prepared by a queue worker
+DEFAULT_BACKGROUND_ROWS = 200000
+DEFAULT_RESULT_TTL = 6 * 60 * 60
+
+PROGRESS_EVENT = "survey_report_progress"
+
+
+def get_background_threshold():
+    return cint(frappe.conf.get("survey_report_background_rows")) or DEFAULT_BACKGROUND_ROWS
+
+
+def should_run_in_background(filters):
+    """
+    Whether a run is too heavy for a web worker
+
+    The number of child rows is read from the Survey Indicator Rollups, so
+    deciding costs one small query. Windowed runs only read one page and
+    always run in the request.
+    """
+    if frappe.flags.in_survey_report_job or cint(filters.get("page_length")) > 0:
+        return False
+    return get_entry_count(filters.get("project_title"), filters.get("dimension")) > get_background_threshold()
+
+
+@contextmanager
+def computed_in_place():
+    """
+    Compute heavy templates in the current process instead of returning the pending result
+
+    For exports, which need the actual rows and already run where waiting is fine.
+    """
+    in_job = frappe.flags.in_survey_report_job
+    frappe.flags.in_survey_report_job = True
+    try:
+        yield
+    finally:
+        frappe.flags.in_survey_report_job = in_job
+
+
+def get_job_id(filters):
+    # The data version is part of the cache key, so new responses lead to a new job
+    return "survey_report::" + ":".join(str(part) for part in get_cache_key(filters)[1:])
+
+
+def get_result_key(job_id):
+    return f"survey_report_background:{job_id}"
+
+
+def get_background_result(filters):
+    """The prepared result for `filters`, None while it is not ready."""
+    compressed = frappe.cache().get_value(get_result_key(get_job_id(filters)))
+    if compressed is None:
+        return None
+    return tuple(json.loads(zlib.decompress(compressed)))
+
+
+def enqueue_report(filters):
+    """
+    Prepare the report in a queue worker, once per filters and data version
+
+    Returns:
+        str: Job id, also sent with every progress event
+    """
+    job_id = get_job_id(filters)
+    frappe.enqueue(
+        run_report_job,
+        queue="long",
+        timeout=cint(frappe.conf.get("survey_report_job_timeout")) or 1500,
+        job_id=job_id,
+        deduplicate=True,
+        filters=dict(filters),
+        report_job_id=job_id,
+        user=frappe.session.user,
+    )
+    return job_id
+
+
+def publish_progress(job_id, user, progress, description, **kwargs):
+    frappe.publish_realtime(
+        PROGRESS_EVENT,
+        {"job_id": job_id, "progress": progress, "description": description, **kwargs},
+        user=user,
+    )
+
+
+def run_report_job(filters, report_job_id, user):
+    """Compute the report, store it compressed for the requests that wait for it and notify the user."""
+    from gisappv1.gisappv1.report.survey_report.survey_report import get_report_result
+
+    frappe.flags.in_survey_report_job = True
+    try:
+        def progress(percent, description):
+            publish_progress(report_job_id, user, percent, description)
+
+        result = get_report_result(filters, progress=progress)
+        frappe.cache().set_value(
+            get_result_key(report_job_id),
+            zlib.compress(json.dumps(result, default=str, separators=(",", ":")).encode()),
+            expires_in_sec=cint(frappe.conf.get("survey_report_cache_ttl")) or DEFAULT_RESULT_TTL,
+        )
+    except Exception:
+        publish_progress(report_job_id, user, 100, _("Survey Report could not be prepared"), done=True, failed=True)
+        frappe.log_error(f"Survey Report job {report_job_id} failed")
+        raise
+    finally:
+        frappe.flags.in_survey_report_job = False
+
+    publish_progress(report_job_id, user, 100, _("Survey Report is ready"), done=True)
+
+
+def get_pending_result(filters, columns):
+    """
+    Empty result shown while the report is being prepared, starts the job if needed
+
+    Args:
+        filters (dict): Report filters
+        columns (list): Report columns, so the grid keeps its headers
+
+    Returns:
+        tuple: (columns, [], message, None)
+    """
+    job_id = enqueue_report(filters)
+    message = _(
+        "This template has too many responses to show right away. The report is being prepared in the background "
+        "and will load here when it is ready."
+    )
+    return columns, [], f'<span data-survey-report-job="{job_id}">{message}</span>', None
+
+
+def is_pending_result(result):
+    """Whether `result` is the placeholder of `get_pending_result` rather than the report."""
+    return len(result) > 2 and "data-survey-report-job" in (result[2] or "")
@@ -0,0 +1,240 @@
+# Copyright (c) 2025, Ashish and contributors
+# For license information, please see license.txt
+
+import atexit
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import frappe
+from frappe import _
+from frappe.utils import cint, get_files_path, now_datetime
+
+from gisappv1.gisappv1.report.survey_report.survey_report_export import get_pdf_export, register_export_file
+
+BULK_PDF_EVENT = "survey_report_bulk_pdf"
+
+DEFAULT_BULK_WORKERS = 4
+
+
+def get_report_name(template, filters):
+    """The title the report page gives the PDF of `template`."""
+    report_name = f"Survey Report - {template}"
+    if filters.get("dimension") and filters.get("dimension") != "All Indicators":
+        report_name += " ({0})".format(filters.get("dimension"))
+    if filters.get("gwgi") and filters.get("gwgi") != "No Filter":
+        report_name += " " + filters.get("gwgi")
+    return report_name
+
+
+def get_template_filters(template, filters):
+    """
+    Report filters of one template of the batch
+
+    Dimensions belong to a template, so the dimension picked on the report
+    page only applies to the template it was picked for. The GWGI choice
+    applies to all of them.
+    """
+    dimension = filters.get("dimension") if template == filters.get("project_title") else None
+    return {
+        "project_title": template,
+        "dimension": dimension or "All Indicators",
+        "gwgi": filters.get("gwgi"),
+    }
+
+
+def get_bulk_workers(template_count):
+    workers = cint(frappe.conf.get("survey_report_bulk_pdf_workers")) or DEFAULT_BULK_WORKERS
+    return max(min(workers, template_count), 1)
+
+
+@frappe.whitelist()
+def enqueue_bulk_pdf_export(templates=None, filters=None):
+    """
+    Export the Survey Report PDF of many Research Templates in one queue job
+
+    Progress is sent to the user with the `survey_report_bulk_pdf` realtime
+    event after every template, the last event has the name of the zip File
+    holding all the PDFs and the time each template took.
+
+    Args:
+        templates (list): Research Templates to export, every readable one when empty
+        filters (dict): Filter values of the report page, see `get_template_filters`
+
+    Returns:
+        dict: {"job_id": ..., "templates": number of templates}
+    """
+    if isinstance(templates, str):
+        templates = json.loads(templates)
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+    filters = {key: (filters or {}).get(key) for key in ("project_title", "dimension", "gwgi")}
+
+    frappe.has_permission("Research Survey", "read", throw=True)
+    if templates:
+        for template in templates:
+            frappe.has_permission("Research Template", "read", template, throw=True)
+    else:
+        templates = frappe.get_list(
+            "Research Template", pluck="name", order_by="name asc", limit_page_length=0
+        )
+
+    if not templates:
+        frappe.throw(_("There are no Research Templates to export"))
+
+    digest = hashlib.sha1(json.dumps([templates, filters]).encode()).hexdigest()
+    job_id = f"survey_report_bulk_pdf::{digest}::{frappe.session.user}"
+    frappe.enqueue(
+        run_bulk_pdf_job,
+        queue="long",
+        timeout=cint(frappe.conf.get("survey_report_bulk_job_timeout")) or 4 * 3600,
+        job_id=job_id,
+        deduplicate=True,
+        templates=templates,
+        filters=filters,
+        bulk_job_id=job_id,
+        user=frappe.session.user,
+    )
+    return {"job_id": job_id, "templates": len(templates)}
+
+
+def publish_bulk_event(job_id, user, **kwargs):
+    frappe.publish_realtime(BULK_PDF_EVENT, {"job_id": job_id, **kwargs}, user=user)
+
+
+def export_template(template, filters):
+    """
+    Render the PDF of one template, failures are recorded instead of stopping the batch
+
+    Returns:
+        dict: template, file_name (None when it failed) and seconds
+    """
+    start = time.perf_counter()
+    template_filters = get_template_filters(template, filters)
+    frappe.flags.in_survey_report_job = True
+    try:
+        file_name = get_pdf_export(template_filters, get_report_name(template, template_filters))
+    except Exception:
+        frappe.log_error(f"Survey Report PDF of {template} failed")
+        file_name = None
+    finally:
+        frappe.flags.in_survey_report_job = False
+
+    return {"template": template, "file_name": file_name, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def init_export_process(site, sites_path, user):
+    """Pool process initializer, every process keeps its own site context and database connection."""
+    frappe.init(site=site, sites_path=sites_path)
+    frappe.connect()
+    frappe.set_user(user)
+    # Spawned processes exit normally when the pool shuts down, the connection is closed then
+    atexit.register(frappe.destroy)
+
+
+def export_template_in_process(template, filters):
+    """`export_template` in a pool process, committed so the job sees its File."""
+    result = export_template(template, filters)
+    frappe.db.commit()
+    return result
+
+
+def iter_template_exports(templates, filters, user):
+    """
+    Yield the result of every template as its PDF is done, in order of completion
+
+    Templates are rendered by at most `survey_report_bulk_pdf_workers` (site
+    config) processes, so running the report and building the HTML are not
+    serialised by the GIL. The processes are spawned rather than forked, a
+    fork would share the job's database connection. With a single worker
+    everything runs in the job's own process and connection.
+    """
+    workers = get_bulk_workers(len(templates))
+    if workers == 1:
+        for template in templates:
+            yield export_template(template, filters)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_export_process,
+        initargs=(frappe.local.site, os.path.abspath(frappe.local.sites_path), user),
+    ) as executor:
+        futures = [executor.submit(export_template_in_process, template, filters) for template in templates]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def make_zip_file(results):
+    """
+    Pack the PDFs of `results` into one private zip File
+
+    The PDFs are copied from disk into the archive one at a time, they are
+    already compressed so they are stored as they are.
+
+    Returns:
+        str: Name of the zip File
+    """
+    # Jobs that end in the same second still get their own archive
+    file_name = "survey_report_bulk_{0}_{1}.zip".format(
+        now_datetime().strftime("%Y%m%d_%H%M%S"), frappe.generate_hash(length=8)
+    )
+    path = get_files_path(file_name, is_private=True)
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+        for result in sorted(results, key=lambda result: result["template"]):
+            if result["file_name"]:
+                pdf_path = frappe.get_doc("File", result["file_name"]).get_full_path()
+                archive.write(pdf_path, "{0}.pdf".format(result["template"].replace("/", "-")))
+
+    file_doc = frappe.get_doc(
+        {
+            "doctype": "File",
+            "file_name": file_name,
+            "file_url": f"/private/files/{file_name}",
+            "file_size": os.path.getsize(path),
+            "is_private": 1,
+        }
+    )
+    file_doc.insert(ignore_permissions=True)
+    register_export_file(file_doc.name)
+    return file_doc.name
+
+
+def run_bulk_pdf_job(templates, filters, bulk_job_id, user):
+    """Render the PDF of every template, report progress as they finish and zip them."""
+    if not templates:
+        publish_bulk_event(
+            bulk_job_id, user, done=True, failed=True, message=_("There are no Research Templates to export")
+        )
+        return None
+
+    results = []
+    try:
+        for result in iter_template_exports(templates, filters, user):
+            results.append(result)
+            publish_bulk_event(
+                bulk_job_id,
+                user,
+                progress=len(results) * 100 / len(templates),
+                description=_("{0} of {1} templates exported").format(len(results), len(templates)),
+                **result,
+            )
+
+        file_name = make_zip_file(results)
+        # The File must be visible before the browser asks for it
+        frappe.db.commit()
+    except Exception:
+        publish_bulk_event(
+            bulk_job_id, user, done=True, failed=True, message=_("The bulk PDF export could not be completed")
+        )
+        frappe.log_error(f"Survey Report bulk PDF job {bulk_job_id} failed")
+        raise
+
+    publish_bulk_event(bulk_job_id, user, done=True, file_name=file_name, timings=results)
+    return file_name
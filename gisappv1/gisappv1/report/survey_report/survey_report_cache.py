@@ -0,0 +1,176 @@
+# Copyright (c) 2025, Ashish and contributors
+# For license information, please see license.txt
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import frappe
+from frappe.utils import cint
+
+DEFAULT_CACHE_SIZE = 128
+DEFAULT_CACHE_TTL = 6 * 60 * 60
+
+CACHED_FILTERS = ("project_title", "dimension", "gwgi", "page_length", "page", "after")
+COUNTERS = ("local_hits", "redis_hits", "misses", "invalidations")
+
+
+class LRUCache:
+    """Bounded, thread safe in-process map that evicts the least recently used entry."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def discard(self, predicate):
+        with self.lock:
+            for key in [key for key in self.entries if predicate(key)]:
+                del self.entries[key]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+local_cache = LRUCache()
+local_counters = dict.fromkeys(COUNTERS, 0)
+
+
+def get_version_key(research_template):
+    return f"survey_report_version:{research_template}"
+
+
+def get_data_version(research_template):
+    """
+    Current data version of a template
+
+    The version is part of every cache key and changes whenever one of the
+    template's surveys or the template itself changes, so stale results are
+    never served, in this process or any other.
+    """
+    version = frappe.cache().get_value(get_version_key(research_template))
+    if not version:
+        version = frappe.generate_hash(length=12)
+        frappe.cache().set_value(get_version_key(research_template), version)
+    return version
+
+
+def invalidate(research_template):
+    """Drop the cached results of one template."""
+    if not research_template:
+        return
+
+    bump_version(research_template)
+    # A report run racing with this transaction could still cache the old rows under the new version
+    frappe.db.after_commit.add(lambda: bump_version(research_template))
+    count("invalidations")
+
+
+def bump_version(research_template):
+    frappe.cache().set_value(get_version_key(research_template), frappe.generate_hash(length=12))
+    site = getattr(frappe.local, "site", None)
+    local_cache.discard(lambda key: key[0] == site and key[1] == research_template)
+
+
+def count(counter):
+    local_counters[counter] += 1
+    cache = frappe.cache()
+    cache.incrby(cache.make_key(f"survey_report_cache:{counter}"), 1)
+
+
+def get_cache_key(filters):
+    values = {fieldname: filters.get(fieldname) for fieldname in CACHED_FILTERS}
+    digest = hashlib.sha1(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
+    research_template = filters.get("project_title")
+    return (getattr(frappe.local, "site", None), research_template, digest, get_data_version(research_template))
+
+
+def copy_result(result):
+    # Frappe may decorate the rows it gets back, never hand out the cached ones
+    columns, data, message, chart = result
+    return [dict(column) for column in columns], [dict(row) for row in data], message, chart
+
+
+def get_cached_result(filters, compute):
+    """
+    Serve `compute(filters)` from the in-process LRU or Redis when possible
+
+    Args:
+        filters (dict): Report filters, only the CACHED_FILTERS are part of the key
+        compute (callable): Builds (columns, data, message, chart) on a miss
+
+    Returns:
+        tuple: (columns, data, message, chart)
+    """
+    local_cache.maxsize = cint(frappe.conf.get("survey_report_cache_size")) or DEFAULT_CACHE_SIZE
+    key = get_cache_key(filters)
+
+    result = local_cache.get(key)
+    if result is not None:
+        count("local_hits")
+        return copy_result(result)
+
+    redis_key = "survey_report_result:{}:{}:{}".format(*key[1:])
+    result = frappe.cache().get_value(redis_key)
+    if result is not None:
+        count("redis_hits")
+        local_cache.set(key, result)
+        return copy_result(result)
+
+    count("misses")
+    result = tuple(compute(filters))
+    local_cache.set(key, result)
+    frappe.cache().set_value(
+        redis_key,
+        result,
+        expires_in_sec=cint(frappe.conf.get("survey_report_cache_ttl")) or DEFAULT_CACHE_TTL,
+    )
+    return copy_result(result)
+
+
+@frappe.whitelist()
+def get_cache_stats():
+    """
+    Hit/miss counters of the Survey Report cache
+
+    Returns:
+        dict: Site wide counters from Redis, plus the counters and size of this process
+    """
+    frappe.only_for("System Manager")
+
+    cache = frappe.cache()
+    return {
+        "site": {counter: cint(cache.get(cache.make_key(f"survey_report_cache:{counter}"))) for counter in COUNTERS},
+        "process": dict(local_counters),
+        "local_entries": len(local_cache),
+        "local_maxsize": local_cache.maxsize,
+    }
+
+
+def invalidate_for_survey(doc, method=None):
+    invalidate(doc.project_title)
+
+    previous = doc.get_doc_before_save() if method == "on_update" else None
+    if previous and previous.project_title != doc.project_title:
+        invalidate(previous.project_title)
+
+
+def invalidate_for_template(doc, method=None, old=None, new=None, merge=False):
+    invalidate(doc.name)
+    if old:
+        invalidate(old)
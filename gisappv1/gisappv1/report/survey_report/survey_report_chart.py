@@ -0,0 +1,206 @@
+# Copyright (c) 2025, Ashish and contributors
+# For license information, please see license.txt
+
+import hashlib
+import json
+import math
+
+import frappe
+from frappe.utils import cint
+from markupsafe import Markup, escape
+
+from gisappv1.gisappv1.report.survey_report.survey_report_cache import DEFAULT_CACHE_TTL, get_cache_key
+
+DEFAULT_COLORS = ["#7cd6fd", "#743ee2", "#ffa3ef", "#ffcc00"]
+FONT = "Arial, sans-serif"
+
+# Survey answers are scored up to 5, the radar scale grows when values are higher
+RADAR_MAX = 5
+# Gridlines of a scale, whatever its top
+TICK_COUNT = 5
+
+
+def fmt(value):
+    # Coordinates with one decimal keep the SVG small and exact enough for print
+    return f"{value:.1f}".rstrip("0").rstrip(".")
+
+
+def get_ticks(maximum, count=TICK_COUNT):
+    """
+    Top of a scale reaching `maximum` and its gridline values, about `count` of them
+
+    Steps are 1, 2 or 5 times a power of ten, so the labels stay round and
+    large values do not draw a line per unit.
+
+    Returns:
+        tuple: (top, [step, 2 * step, ..., top])
+    """
+    raw_step = maximum / count
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(factor * magnitude for factor in (1, 2, 5, 10) if factor * magnitude >= raw_step)
+    steps = math.ceil(maximum / step)
+    return step * steps, [step * index for index in range(1, steps + 1)]
+
+
+def text(x, y, value, size=11, anchor="middle", weight=None, transform=None):
+    attributes = f' font-weight="{weight}"' if weight else ""
+    if transform:
+        attributes += f' transform="{transform}"'
+    return (
+        f'<text x="{fmt(x)}" y="{fmt(y)}" font-size="{size}" text-anchor="{anchor}"{attributes}>'
+        f"{escape(value)}</text>"
+    )
+
+
+def legend(names, colors, width, y):
+    """One row of color swatches and dataset names, centered."""
+    item_widths = [18 + 7 * len(str(name)) for name in names]
+    x = (width - sum(item_widths)) / 2
+    parts = []
+    for name, color, item_width in zip(names, colors, item_widths):
+        parts.append(f'<rect x="{fmt(x)}" y="{fmt(y - 9)}" width="10" height="10" fill="{color}"/>')
+        parts.append(text(x + 14, y, name, size=10, anchor="start"))
+        x += item_width
+    return "".join(parts)
+
+
+def svg(width, height, title, body):
+    return Markup(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="{FONT}">'
+        f"{text(width / 2, 20, title, size=14, weight='bold')}{''.join(body)}</svg>"
+    )
+
+
+def render_radar(title, labels, datasets, colors, width=520, height=460):
+    """
+    Radar chart of `datasets` over the `labels` axes, like the one the report page draws
+
+    Args:
+        title (str): Chart title
+        labels (list): Axis labels
+        datasets (list): [{"name": ..., "values": [...]}] with one value per label
+        colors (list): Color of every dataset
+
+    Returns:
+        Markup: The <svg> element
+    """
+    count = len(labels)
+    cx, cy = width / 2, height / 2 + 30
+    radius = min(width, height) / 2 - 80
+    top, ticks = get_ticks(max([RADAR_MAX] + [value or 0 for dataset in datasets for value in dataset["values"]]))
+
+    def point(index, value):
+        angle = 2 * math.pi * index / count - math.pi / 2
+        distance = radius * (value or 0) / top
+        return cx + distance * math.cos(angle), cy + distance * math.sin(angle)
+
+    body = [legend([dataset["name"] for dataset in datasets], colors, width, 44)]
+
+    # Grid rings, one per scale step, and the axes
+    for tick in ticks:
+        ring = " ".join(f"{fmt(x)},{fmt(y)}" for x, y in (point(index, tick) for index in range(count)))
+        body.append(f'<polygon points="{ring}" fill="none" stroke="#ddd"/>')
+        body.append(text(cx + 3, cy - radius * tick / top, fmt(tick), size=8, anchor="start"))
+    for index, label in enumerate(labels):
+        x, y = point(index, top)
+        body.append(f'<line x1="{fmt(cx)}" y1="{fmt(cy)}" x2="{fmt(x)}" y2="{fmt(y)}" stroke="#ddd"/>')
+        lx, ly = point(index, top * 1.12)
+        anchor = "middle" if abs(lx - cx) < 1 else ("start" if lx > cx else "end")
+        body.append(text(lx, ly + 4, label, size=10, anchor=anchor))
+
+    for dataset, color in zip(datasets, colors):
+        shape = " ".join(
+            f"{fmt(x)},{fmt(y)}" for x, y in (point(index, value) for index, value in enumerate(dataset["values"]))
+        )
+        body.append(
+            f'<polygon points="{shape}" fill="{color}" fill-opacity="0.2" stroke="{color}" stroke-width="2"/>'
+        )
+
+    return svg(width, height, title, body)
+
+
+def render_bar(title, labels, datasets, colors, width=720, height=340):
+    """
+    Grouped bar chart, one group per label and one bar per dataset
+
+    Returns:
+        Markup: The <svg> element
+    """
+    left, right, top_margin, bottom = 40, 10, 60, 90
+    plot_width = width - left - right
+    plot_height = height - top_margin - bottom
+    top, ticks = get_ticks(max([value or 0 for dataset in datasets for value in dataset["values"]] + [1]))
+
+    body = [legend([dataset["name"] for dataset in datasets], colors, width, 44)]
+
+    for tick in [0] + ticks:
+        y = top_margin + plot_height - plot_height * tick / top
+        body.append(f'<line x1="{left}" y1="{fmt(y)}" x2="{width - right}" y2="{fmt(y)}" stroke="#eee"/>')
+        body.append(text(left - 6, y + 3, fmt(tick), size=9, anchor="end"))
+
+    group_width = plot_width / max(len(labels), 1)
+    bar_width = group_width * 0.7 / max(len(datasets), 1)
+    for index, label in enumerate(labels):
+        x = left + group_width * index + group_width * 0.15
+        for dataset, color in zip(datasets, colors):
+            value = dataset["values"][index] or 0
+            bar_height = plot_height * value / top
+            if bar_height > 0:
+                body.append(
+                    f'<rect x="{fmt(x)}" y="{fmt(top_margin + plot_height - bar_height)}" '
+                    f'width="{fmt(bar_width)}" height="{fmt(bar_height)}" fill="{color}"/>'
+                )
+            x += bar_width
+        label_x = left + group_width * (index + 0.5)
+        label_y = top_margin + plot_height + 12
+        body.append(
+            text(label_x, label_y, label, size=9, anchor="end", transform=f"rotate(-35 {fmt(label_x)} {fmt(label_y)})")
+        )
+
+    return svg(width, height, title, body)
+
+
+def render_charts(chart, title):
+    """
+    SVG versions of a report chart, as `create_chart` / `create_gwgi_chart` build it
+
+    The per-indicator chart is drawn both as the radar the report page shows
+    (the variables and their average, without the dimension average bar) and
+    as bars. The GWGI chart is drawn as bars.
+
+    Returns:
+        list: <svg> Markup elements
+    """
+    if not chart:
+        return []
+
+    labels = chart["data"]["labels"]
+    datasets = chart["data"]["datasets"]
+    colors = chart.get("colors") or DEFAULT_COLORS
+
+    charts = []
+    # A radar needs three axes, the last label and dataset only carry the dimension average
+    if len(datasets) > 1 and len(labels) > 3:
+        radar_datasets = [{"name": dataset["name"], "values": dataset["values"][:-1]} for dataset in datasets[:3]]
+        charts.append(render_radar(title, labels[:-1], radar_datasets, colors))
+    charts.append(render_bar(chart.get("title") or title, labels, datasets, colors))
+    return charts
+
+
+def get_chart_key(filters, title):
+    # The report cache key holds the data version, so new responses draw new charts
+    digest = hashlib.sha1(json.dumps([get_cache_key(filters), title], default=str).encode()).hexdigest()
+    return f"survey_report_chart_svg:{digest}"
+
+
+def get_chart_svgs(filters, chart, title):
+    """`render_charts`, cached per filters, title and data version of the template."""
+    key = get_chart_key(filters, title)
+    charts = frappe.cache().get_value(key)
+    if charts is None:
+        charts = [str(chart_svg) for chart_svg in render_charts(chart, title)]
+        frappe.cache().set_value(
+            key, charts, expires_in_sec=cint(frappe.conf.get("survey_report_cache_ttl")) or DEFAULT_CACHE_TTL
+        )
+    return [Markup(chart_svg) for chart_svg in charts]
@@ -0,0 +1,193 @@
+# Copyright (c) 2025, Ashish and contributors
+# For license information, please see license.txt
+
+import csv
+import io
+import json
+import tempfile
+from itertools import groupby
+from operator import itemgetter
+
+import frappe
+from frappe import _
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+from gisappv1.profiling import phase, report_profile
+from gisappv1.gisappv1.doctype.research_template.template_metadata import (
+    get_report_columns,
+    get_template_indicators,
+    get_template_meta,
+    to_camel_case,
+)
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+SURVEY_COLUMN = {"label": "Survey", "fieldname": "parent"}
+
+
+def get_download_columns(meta, filter_dimension):
+    """The report columns, with the survey name first since the rows are not linked to the surveys."""
+    return [SURVEY_COLUMN] + get_report_columns(meta, filter_dimension)
+
+
+def iter_survey_rows(grouped_rows, column_key):
+    """
+    Turn the (parent, indicator, variable1, variable2) rows of a survey into its report row
+
+    Rows arrive ordered by survey, so each survey is yielded as soon as its
+    last indicator is read and only one survey is held at a time.
+    """
+    column_keys = {}
+    for parent, indicators in groupby(grouped_rows, key=itemgetter(0)):
+        row = {"parent": parent}
+        for _parent, indicator, variable1, variable2 in indicators:
+            key = column_keys.get(indicator)
+            if key is None:
+                key = column_keys[indicator] = column_key(indicator)
+            # Indicators that only differ in spacing share a column, so accumulate
+            row["variable1" + key] = row.get("variable1" + key, 0) + variable1
+            row["variable2" + key] = row.get("variable2" + key, 0) + variable2
+        yield row
+
+
+def iter_pivot_rows(filters):
+    """
+    Yield the header and every row of the survey x indicator pivot, as lists of cell values
+
+    The survey rows are streamed from an unbuffered cursor, so nothing else
+    can be queried until the generator is exhausted. The averages are read
+    from the rollups before that and come last, as in the report.
+    """
+    from gisappv1.gisappv1.report.survey_report.survey_report import (
+        get_average_label,
+        get_grouped_survey_totals,
+        get_summary,
+    )
+
+    research_template = filters.get("project_title")
+    filter_dimension = filters.get("dimension")
+
+    meta = get_template_meta(research_template)
+    indicators_list = get_template_indicators(meta, filter_dimension)
+    columns = get_download_columns(meta, filter_dimension)
+    fieldnames = [column["fieldname"] for column in columns]
+    average_rows = get_summary(research_template, filter_dimension, indicators_list).average_rows(
+        get_average_label(filter_dimension)
+    )
+
+    yield [column["label"] for column in columns]
+
+    template_keys = {indicator["indicator"]: indicator["key"] for indicator in indicators_list}
+    with frappe.db.unbuffered_cursor():
+        survey_rows = iter_survey_rows(
+            get_grouped_survey_totals(research_template, filter_dimension),
+            lambda indicator: template_keys.get(indicator) or to_camel_case(indicator),
+        )
+        for row in survey_rows:
+            yield [row.get(fieldname) for fieldname in fieldnames]
+
+    for row in average_rows:
+        # The average rows are labelled in the project column, they belong to no survey
+        row = dict(row, parent=None)
+        yield [row.get(fieldname) for fieldname in fieldnames]
+
+
+def write_csv(rows, file):
+    text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    text.flush()
+    # The caller owns the file
+    text.detach()
+    return count
+
+
+def write_xlsx(rows, file):
+    from openpyxl import Workbook
+
+    # Write-only sheets go to disk row by row instead of keeping every cell
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Survey Report")
+    count = 0
+    for row in rows:
+        sheet.append(row)
+        count += 1
+    workbook.save(file)
+    return count
+
+
+WRITERS = {"csv": write_csv, "xlsx": write_xlsx}
+
+
+def make_download(filters, file_type):
+    """
+    Write the pivot to an anonymous temporary file and send it in blocks
+
+    The web request closes its database connection before the response
+    body goes out, so the rows are written while the request runs and the
+    file streams afterwards. The file is gone once it is closed.
+
+    Returns:
+        Response: Attachment streamed from the temporary file
+    """
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+    filters = frappe._dict(filters or {})
+
+    if not filters.get("project_title"):
+        frappe.throw(_("Please select a Research Template"))
+
+    frappe.has_permission("Research Survey", "read", throw=True)
+    frappe.has_permission("Research Template", "read", filters.project_title, throw=True)
+
+    file = tempfile.TemporaryFile()
+    with report_profile(f"Survey Report {file_type.upper()}", filters):
+        with phase("write") as write_phase:
+            write_phase.rows = WRITERS[file_type](iter_pivot_rows(filters), file)
+
+    size = file.tell()
+    file.seek(0)
+
+    request = getattr(frappe.local, "request", None)
+    environ = request.environ if request else {}
+    response = Response(wrap_file(environ, file), mimetype=CONTENT_TYPES[file_type], direct_passthrough=True)
+    response.headers["Content-Length"] = str(size)
+    response.headers["Content-Disposition"] = 'attachment; filename="{0}_survey_report.{1}"'.format(
+        frappe.scrub(filters.project_title), file_type
+    )
+    return response
+
+
+@frappe.whitelist()
+def download_csv(filters):
+    """
+    Download the survey x indicator pivot of the Survey Report as CSV
+
+    Args:
+        filters (dict): Filter values for the report
+
+    Returns:
+        Response: The CSV file
+    """
+    return make_download(filters, "csv")
+
+
+@frappe.whitelist()
+def download_xlsx(filters):
+    """
+    Download the survey x indicator pivot of the Survey Report as an Excel workbook
+
+    Args:
+        filters (dict): Filter values for the report
+
+    Returns:
+        Response: The XLSX file
+    """
+    return make_download(filters, "xlsx")
@@ -0,0 +1,289 @@
+# Copyright (c) 2025, Ashish and contributors
+# For license information, please see license.txt
+
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import unicodedata
+from urllib.parse import quote
+
+import frappe
+from frappe import _
+from frappe.utils import add_to_date, cint, flt, get_datetime, now_datetime
+
+from gisappv1.gisappv1.report.survey_report.survey_report_cache import get_cache_key
+
+PDF_EVENT = "survey_report_pdf"
+
+DEFAULT_PDF_MAX_AGE_DAYS = 7
+DEFAULT_PDF_BUDGET_MB = 500
+# Superseded PDFs stay a little longer, the browser may still be downloading them
+SUPERSEDED_GRACE_MINUTES = 60
+
+
+def get_export_scope(filters, report_name):
+    # The report cache key without its data version
+    _site, research_template, digest, _version = get_cache_key(filters)
+    return hashlib.sha1(json.dumps([research_template, digest, report_name]).encode()).hexdigest()
+
+
+def get_export_key(filters, report_name, chart_image=None):
+    """
+    Content address of a PDF: its scope, the data version of the template and the chart image
+
+    Two exports with the same key produce the same document, so the first
+    one's File is reused.
+    """
+    version = get_cache_key(filters)[3]
+    chart_hash = hashlib.sha1((chart_image or "").encode()).hexdigest()
+    return hashlib.sha1(
+        json.dumps([get_export_scope(filters, report_name), version, chart_hash]).encode()
+    ).hexdigest()
+
+
+def get_cached_pdf(filters, report_name, chart_image=None):
+    """Name of the File of an identical earlier export, None when it has to be rendered."""
+    return frappe.db.get_value(
+        "Survey Report Export", {"export_key": get_export_key(filters, report_name, chart_image)}, "file"
+    )
+
+
+def get_pdf_export(filters, report_name, chart_image=None):
+    """
+    File name of the PDF export, rendered only when no identical export exists
+
+    A new export of a scope supersedes the previous one, which the
+    retention task removes.
+    """
+    from gisappv1.gisappv1.report.survey_report.survey_report import make_pdf_file
+
+    file_name = get_cached_pdf(filters, report_name, chart_image)
+    if file_name:
+        return file_name
+
+    export_key = get_export_key(filters, report_name, chart_image)
+    file_name = make_pdf_file(filters, report_name, chart_image, get_pdf_file_name(report_name, export_key))
+    register_export_file(
+        file_name, filters.get("project_title"), get_export_scope(filters, report_name), export_key
+    )
+    return file_name
+
+
+def get_pdf_file_name(report_name, export_key):
+    # The report name comes from the browser, only word characters and dashes reach the disk and the headers
+    return "{0}_{1}.pdf".format(re.sub(r"[^\w-]+", "_", report_name.lower()).strip("_"), export_key[:16])
+
+
+def get_filename_options(file_name):
+    """Content-Disposition options of `file_name`, with an ASCII fallback like werkzeug's `send_file`."""
+    try:
+        file_name.encode("ascii")
+        return {"filename": file_name}
+    except UnicodeEncodeError:
+        return {
+            "filename": unicodedata.normalize("NFKD", file_name).encode("ascii", "ignore").decode("ascii"),
+            "filename*": "UTF-8''" + quote(file_name, safe="!#$&+-.^_`|~"),
+        }
+
+
+def register_export_file(file_name, research_template=None, export_scope=None, export_key=None):
+    """
+    Record a File as a Survey Report export, for reuse, downloads by other users and the retention task
+
+    The record is kept in the database, so the exports outlive a cleared cache.
+
+    Args:
+        file_name (str): Name of the File
+        research_template (str): Template of a PDF, None for bulk zips
+        export_scope (str): See `get_export_scope`, None for bulk zips
+        export_key (str): See `get_export_key`, None for bulk zips
+    """
+    frappe.get_doc(
+        {
+            "doctype": "Survey Report Export",
+            "file": file_name,
+            "research_template": research_template,
+            "export_scope": export_scope,
+            "export_key": export_key,
+        }
+    ).insert(ignore_permissions=True)
+
+
+def can_download_export(file_name):
+    """
+    Whether the user may download a PDF export rendered for someone else
+
+    PDFs are shared by everyone who exports the same scope, so reading the
+    surveys of their template is enough. Bulk zips are not shared.
+    """
+    research_template = frappe.db.get_value("Survey Report Export", {"file": file_name}, "research_template")
+    if not research_template:
+        return False
+    return frappe.has_permission("Research Survey", "read") and frappe.has_permission(
+        "Research Template", "read", research_template
+    )
+
+
+def send_export_file(file_name):
+    """
+    Send a File from disk in blocks instead of reading it into the worker
+
+    Range requests get partial responses, so large PDFs can be resumed and
+    paged through by the browser. Behind nginx, which sets
+    `X-Use-X-Accel-Redirect` like Frappe's own config, the transfer is handed
+    to the proxy once the permission check passed.
+
+    Args:
+        file_name (str): Name of the File document
+
+    Returns:
+        Response: The file, or the X-Accel-Redirect to it
+    """
+    from werkzeug.utils import send_file
+    from werkzeug.wrappers import Response
+
+    file_doc = frappe.get_doc("File", file_name)
+    # An export may have been rendered for another user of the same scope
+    if not file_doc.is_downloadable() and not can_download_export(file_doc.name):
+        frappe.throw(_("You don't have permission to access this file"), frappe.PermissionError)
+
+    path = file_doc.get_full_path()
+    if not os.path.exists(path):
+        frappe.throw(_("File {0} does not exist").format(file_doc.file_name), frappe.DoesNotExistError)
+
+    mimetype = mimetypes.guess_type(file_doc.file_name)[0] or "application/octet-stream"
+    request = frappe.local.request
+    if file_doc.is_private and request.headers.get("X-Use-X-Accel-Redirect"):
+        response = Response(mimetype=mimetype)
+        response.headers["X-Accel-Redirect"] = quote("/protected" + file_doc.file_url)
+        # Quoted by werkzeug, the name may hold anything the user typed
+        response.headers.set("Content-Disposition", "attachment", **get_filename_options(file_doc.file_name))
+        return response
+
+    return send_file(
+        path,
+        request.environ,
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=file_doc.file_name,
+        conditional=True,
+    )
+
+
+@frappe.whitelist()
+def enqueue_pdf_export(filters, report_name, chart_image=None):
+    """
+    Export the Survey Report to PDF in a queue worker instead of the web request
+
+    The `survey_report_pdf` realtime event is sent to the user when the job
+    ends, with the name of the File to download through `get_pdf_file`.
+
+    Args:
+        filters (dict): Filter values for the report
+        report_name (str): Name for the PDF report
+        chart_image (str): Base64 encoded image of the chart
+
+    Returns:
+        dict: {"job_id": ...}, also sent with the realtime event, or {"file_name": ...}
+            right away when an identical PDF was already exported
+    """
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+
+    file_name = get_cached_pdf(filters, report_name, chart_image)
+    if file_name:
+        return {"file_name": file_name}
+
+    # Repeated clicks while the PDF is rendered join the queued job
+    job_id = "survey_report_pdf::{0}::{1}".format(
+        get_export_key(filters, report_name, chart_image), frappe.session.user
+    )
+    frappe.enqueue(
+        run_pdf_job,
+        queue="long",
+        timeout=cint(frappe.conf.get("survey_report_job_timeout")) or 1500,
+        job_id=job_id,
+        deduplicate=True,
+        filters=filters,
+        report_name=report_name,
+        chart_image=chart_image,
+        pdf_job_id=job_id,
+        user=frappe.session.user,
+    )
+    return {"job_id": job_id}
+
+
+def publish_pdf_event(job_id, user, report_name, **kwargs):
+    frappe.publish_realtime(PDF_EVENT, {"job_id": job_id, "report_name": report_name, **kwargs}, user=user)
+
+
+def run_pdf_job(filters, report_name, chart_image, pdf_job_id, user):
+    """Render the PDF and tell the user which File holds it."""
+    # Already in a worker, heavy templates are computed right here
+    frappe.flags.in_survey_report_job = True
+    try:
+        file_name = get_pdf_export(filters, report_name, chart_image)
+        # The File must be visible before the browser asks for it
+        frappe.db.commit()
+    except Exception:
+        publish_pdf_event(
+            pdf_job_id, user, report_name, failed=True, message=_("The PDF export could not be completed")
+        )
+        frappe.log_error(f"Survey Report PDF job {pdf_job_id} failed")
+        raise
+    finally:
+        frappe.flags.in_survey_report_job = False
+
+    publish_pdf_event(pdf_job_id, user, report_name, file_name=file_name)
+
+
+def get_export_files():
+    """The Survey Report PDFs and bulk export zips, newest first."""
+    return frappe.get_all(
+        "Survey Report Export",
+        fields=["name", "file", "file_size", "export_scope", "creation"],
+        order_by="creation desc",
+    )
+
+
+def delete_old_pdf_exports():
+    """
+    Delete the Survey Report PDFs that are too old, superseded or over the disk budget
+
+    Configured with `survey_report_pdf_max_age_days` and
+    `survey_report_pdf_budget_mb` in the site config. The newest PDFs are
+    kept first when the budget is exceeded. Bulk export zips are never
+    superseded, they only age out or go over the budget.
+
+    Returns:
+        list: Names of the deleted Files
+    """
+    max_age = cint(frappe.conf.get("survey_report_pdf_max_age_days")) or DEFAULT_PDF_MAX_AGE_DAYS
+    budget = (flt(frappe.conf.get("survey_report_pdf_budget_mb")) or DEFAULT_PDF_BUDGET_MB) * 1024 * 1024
+    expired_before = add_to_date(now_datetime(), days=-max_age)
+    superseded_before = add_to_date(now_datetime(), minutes=-SUPERSEDED_GRACE_MINUTES)
+
+    # Newest first, so the export seen first for a scope is its current PDF
+    scopes = set()
+    kept_size = 0
+    deleted = []
+    for export in get_export_files():
+        creation = get_datetime(export.creation)
+        # Bulk zips have no scope
+        superseded = export.export_scope in scopes
+        if export.export_scope:
+            scopes.add(export.export_scope)
+        if (
+            creation < expired_before
+            or (superseded and creation < superseded_before)
+            or kept_size + cint(export.file_size) > budget
+        ):
+            # Takes its File along
+            frappe.delete_doc("Survey Report Export", export.name, ignore_permissions=True)
+            deleted.append(export.file)
+        else:
+            kept_size += cint(export.file_size)
+
+    return deleted
@@ -0,0 +1,450 @@
+# Copyright (c) 2025, Ashish and Contributors
+# See license.txt
+
+import csv
+import io
+import zipfile
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import set_request
+from pypdf import PdfReader, PdfWriter
+from werkzeug.http import parse_options_header
+
+from gisappv1 import report_pdf
+from gisappv1.api.gwgi import get_gwgi_overview
+from gisappv1.gisappv1.report.survey_report.survey_report import (
+	execute,
+	export_to_pdf,
+	get_pdf_file,
+	make_pdf_file,
+)
+from gisappv1.gisappv1.report.survey_report.survey_report_background import get_pending_result, run_report_job
+from gisappv1.gisappv1.report.survey_report.survey_report_bulk import (
+	BULK_PDF_EVENT,
+	enqueue_bulk_pdf_export,
+	get_template_filters,
+	run_bulk_pdf_job,
+)
+from gisappv1.gisappv1.report.survey_report.survey_report_cache import local_counters
+from gisappv1.gisappv1.report.survey_report.survey_report_chart import get_chart_svgs, get_ticks, render_charts
+from gisappv1.gisappv1.report.survey_report.survey_report_download import download_csv, iter_pivot_rows
+from gisappv1.gisappv1.report.survey_report.survey_report_export import (
+	PDF_EVENT,
+	can_download_export,
+	delete_old_pdf_exports,
+	enqueue_pdf_export,
+	get_cached_pdf,
+	get_pdf_file_name,
+	run_pdf_job,
+)
+from gisappv1.indexes import REPORT_INDEXES
+
+TEST_TEMPLATE = "_Test Survey Report Template"
+
+
+def make_blank_pdf(html, options=None):
+	"""Stands in for wkhtmltopdf: one page per document."""
+	writer = PdfWriter()
+	writer.add_blank_page(width=100, height=100)
+	output = io.BytesIO()
+	writer.write(output)
+	return output.getvalue()
+
+
+def fail_missing_template(html, options=None):
+	if "_Test Missing Template" in html:
+		raise OSError("wkhtmltopdf exited with an error")
+	return make_blank_pdf(html, options)
+
+
+def make_test_template():
+	if frappe.db.exists("Research Template", TEST_TEMPLATE):
+		return frappe.get_doc("Research Template", TEST_TEMPLATE)
+
+	return frappe.get_doc(
+		{
+			"doctype": "Research Template",
+			"project_title": TEST_TEMPLATE,
+			"table_gohs": [
+				{"dimensions": "Water", "weightage": 60},
+				{"dimensions": "Soil", "weightage": 40},
+			],
+			"table_zuog": [
+				{"indicators": "Rain Fall", "dimension": "Water", "weight_dimension": 60},
+				{"indicators": "Clay", "dimension": "Soil", "weight_dimension": 40},
+			],
+		}
+	).insert()
+
+
+def make_test_survey(values):
+	"""Create a Research Survey from {indicator: (variable1, variable2)}."""
+	dimensions = {"Rain Fall": "Water", "Clay": "Soil"}
+	return frappe.get_doc(
+		{
+			"doctype": "Research Survey",
+			"project_title": TEST_TEMPLATE,
+			"table_bgyj": [
+				{
+					"indicator": indicator,
+					"dimension": dimensions[indicator],
+					"variable1": variable1,
+					"variable2": variable2,
+				}
+				for indicator, (variable1, variable2) in values.items()
+			],
+		}
+	).insert()
+
+
+class TestSurveyReport(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_template()
+		make_test_survey({"Rain Fall": (1, 2), "Clay": (3, 1)})
+		make_test_survey({"Rain Fall": (3, 3), "Clay": (1, 1)})
+
+	def test_summary_rows(self):
+		columns, data, _message, chart = execute(
+			{"project_title": TEST_TEMPLATE, "dimension": "All Indicators"}
+		)
+
+		self.assertEqual(len(columns), 5)
+		self.assertEqual(len(data), 5)
+
+		averages, averaged1, averaged2 = data[-3:]
+		self.assertEqual(averages["variable1RainFall"], 2.0)
+		self.assertEqual(averages["variable2RainFall"], 2.5)
+		self.assertEqual(averages["variable1Clay"], 2.0)
+		self.assertEqual(averages["variable2Clay"], 1.0)
+		self.assertEqual(averaged1["variable1RainFall"], 2.25)
+		self.assertEqual(averaged1["variable1Clay"], 1.5)
+		self.assertEqual(averaged2["variable1RainFall"], 1.875)
+		self.assertEqual(chart["type"], "bar")
+
+	def test_dimension_filter(self):
+		columns, data, _message, _chart = execute(
+			{"project_title": TEST_TEMPLATE, "dimension": "Soil"}
+		)
+
+		self.assertEqual([c["fieldname"] for c in columns[1:]], ["variable1Clay", "variable2Clay"])
+		self.assertEqual(data[-3]["variable1Clay"], 2.0)
+		self.assertNotIn("variable1RainFall", data[-3])
+
+	def test_gwgi_chart(self):
+		_columns, _data, _message, chart = execute(
+			{"project_title": TEST_TEMPLATE, "dimension": "All Indicators", "gwgi": "GWGI"}
+		)
+
+		labels = chart["data"]["labels"]
+		values = chart["data"]["datasets"][0]["values"]
+		self.assertEqual(labels, ["Water", "Soil", "GWGI"])
+		self.assertAlmostEqual(values[-1], 2.25 * 0.6 + 1.5 * 0.4)
+
+	def test_gwgi_overview(self):
+		_columns, _data, _message, chart = execute(
+			{"project_title": TEST_TEMPLATE, "dimension": "All Indicators", "gwgi": "GWGI"}
+		)
+		overview = get_gwgi_overview([TEST_TEMPLATE])
+
+		self.assertEqual(len(overview["data"]), 1)
+		row = dict(zip(overview["columns"], overview["data"][0]))
+		self.assertEqual(row["survey_count"], 2)
+		self.assertAlmostEqual(row["gwgi"], chart["data"]["datasets"][0]["values"][-1])
+		self.assertAlmostEqual(row["Water"], 2.25)
+		self.assertAlmostEqual(row["Soil"], 1.5)
+
+		# Templates the user cannot read are left out, even when asked for
+		with patch("frappe.get_list", return_value=[]):
+			self.assertEqual(get_gwgi_overview([TEST_TEMPLATE])["data"], [])
+
+	def test_windowed_mode(self):
+		filters = {"project_title": TEST_TEMPLATE, "dimension": "All Indicators"}
+		_columns, full, _message, _chart = execute(filters)
+
+		_columns, first, message, _chart = execute({**filters, "page_length": 1, "page": 1})
+		_columns, second, _message, _chart = execute({**filters, "page_length": 1, "page": 2})
+
+		self.assertEqual(first[:-3] + second[:-3], full[:-3])
+		self.assertEqual(first[-3:], full[-3:])
+		self.assertIn("2", message)
+
+		_columns, keyset, _message, _chart = execute({**filters, "page_length": 1, "after": first[0]["parent"]})
+		self.assertEqual(keyset[:-3], second[:-3])
+
+	def test_background_mode(self):
+		filters = {"project_title": TEST_TEMPLATE, "dimension": "All Indicators"}
+		_columns, expected, _message, _chart = execute(filters)
+
+		frappe.local.conf.survey_report_background_rows = 1
+		try:
+			with patch("frappe.enqueue") as enqueue:
+				columns, data, message, _chart = execute(filters)
+
+			self.assertEqual(len(columns), 5)
+			self.assertEqual(data, [])
+			self.assertIn("background", message)
+			enqueue.assert_called_once()
+
+			job = enqueue.call_args.kwargs
+			run_report_job(job["filters"], job["report_job_id"], job["user"])
+			_columns, data, _message, _chart = execute(filters)
+			self.assertEqual(data, expected)
+		finally:
+			frappe.local.conf.survey_report_background_rows = 0
+
+	def test_pdf_of_background_template(self):
+		filters = {"project_title": TEST_TEMPLATE, "dimension": "All Indicators"}
+		frappe.local.conf.survey_report_background_rows = 1
+		try:
+			with (
+				patch("frappe.enqueue") as enqueue,
+				patch.object(report_pdf, "get_report_pdf", return_value=b"%PDF-1.4") as get_report_pdf,
+			):
+				make_pdf_file(filters, "Survey Report Background")
+		finally:
+			frappe.local.conf.survey_report_background_rows = 0
+
+		# The export computed the rows itself instead of rendering the pending placeholder
+		enqueue.assert_not_called()
+		_report_name, _columns, data = get_report_pdf.call_args.args[:3]
+		surveys = [row for row in data if not row["parent"].startswith("average")]
+		self.assertEqual(len(surveys), 2)
+
+		# A pending placeholder is never rendered nor remembered for reuse
+		pending = get_pending_result(filters, [])
+		with (
+			patch("frappe.enqueue"),
+			patch("gisappv1.gisappv1.report.survey_report.survey_report.execute", return_value=pending),
+			self.assertRaises(frappe.ValidationError),
+		):
+			export_to_pdf(filters, "Survey Report Pending")
+		self.assertIsNone(get_cached_pdf(filters, "Survey Report Pending"))
+
+	def test_result_cache(self):
+		filters = {"project_title": TEST_TEMPLATE, "dimension": "Water"}
+		execute(filters)
+
+		hits, misses = local_counters["local_hits"], local_counters["misses"]
+		_columns, data, _message, _chart = execute(filters)
+		self.assertEqual(local_counters["local_hits"], hits + 1)
+		self.assertEqual(local_counters["misses"], misses)
+
+		# Changing a survey of the template must not serve the old averages
+		survey = make_test_survey({"Rain Fall": (0, 0)})
+		_columns, fresh, _message, _chart = execute(filters)
+		self.assertEqual(local_counters["misses"], misses + 1)
+		self.assertEqual(len(fresh), len(data) + 1)
+
+		survey.delete()
+		_columns, fresh, _message, _chart = execute(filters)
+		self.assertEqual(len(fresh), len(data))
+
+	def test_report_indexes(self):
+		# Created by the before_tests hook, ALTER TABLE here would commit the fixtures
+		for doctype, _fields, index_name in REPORT_INDEXES:
+			self.assertTrue(frappe.db.has_index(f"tab{doctype}", index_name))
+
+	def test_pdf_html(self):
+		columns, data = execute({"project_title": TEST_TEMPLATE, "dimension": "All Indicators"})[:2]
+		html = report_pdf.render("<Survey & Report>", columns, data)
+
+		self.assertIn("&lt;Survey &amp; Report&gt;", html)
+		self.assertEqual(html.count("<tr>"), len(data) + 1)
+		self.assertEqual(html.count("<th>"), len(report_pdf.get_visible_columns(columns)))
+		# Floats always show two decimals
+		self.assertRegex(html, r"<td>\d+\.\d\d</td>")
+		self.assertNotRegex(html, r"<td>\d+\.\d{3,}</td>")
+
+	def test_pdf_export_job(self):
+		filters = {"project_title": TEST_TEMPLATE, "dimension": "All Indicators"}
+		with patch("frappe.enqueue") as enqueue:
+			job_id = enqueue_pdf_export(filters, "Survey Report")["job_id"]
+		job = enqueue.call_args.kwargs
+		self.assertEqual(job["job_id"], job_id)
+
+		with (
+			patch("frappe.utils.pdf.get_pdf", return_value=b"%PDF-1.4"),
+			patch("frappe.publish_realtime") as publish_realtime,
+			patch.object(frappe.db, "commit"),
+		):
+			run_pdf_job(job["filters"], job["report_name"], job["chart_image"], job["pdf_job_id"], job["user"])
+
+		event, message = publish_realtime.call_args.args
+		self.assertEqual(event, PDF_EVENT)
+		self.assertEqual(message["job_id"], job_id)
+		self.assertEqual(frappe.db.get_value("File", message["file_name"], "is_private"), 1)
+
+	def test_pdf_export_reuse(self):
+		filters = {"project_title": TEST_TEMPLATE, "dimension": "Soil"}
+		with patch("frappe.utils.pdf.get_pdf", return_value=b"%PDF-1.4") as get_pdf:
+			file_name = export_to_pdf(filters, "Survey Report", "data:image/png;base64,AAAA")
+			self.assertEqual(export_to_pdf(filters, "Survey Report", "data:image/png;base64,AAAA"), file_name)
+			self.assertEqual(get_pdf.call_count, 1)
+			self.assertEqual(enqueue_pdf_export(filters, "Survey Report", "data:image/png;base64,AAAA"), {"file_name": file_name})
+
+			# New responses or another chart make another document
+			self.assertNotEqual(export_to_pdf(filters, "Survey Report", "data:image/png;base64,BBBB"), file_name)
+			survey = make_test_survey({"Clay": (1, 1)})
+			# The other tests share the template's surveys
+			self.addCleanup(survey.delete)
+			self.assertNotEqual(export_to_pdf(filters, "Survey Report", "data:image/png;base64,AAAA"), file_name)
+
+		# The first PDF is superseded, and past the age limit it goes as well.
+		# The exports are recorded in the database, a cleared cache does not orphan them.
+		frappe.clear_cache()
+		frappe.db.set_value(
+			"Survey Report Export", {"file": file_name}, "creation", "2000-01-01 00:00:00", update_modified=False
+		)
+		self.assertIn(file_name, delete_old_pdf_exports())
+		self.assertFalse(frappe.db.exists("File", file_name))
+		self.assertFalse(frappe.db.exists("Survey Report Export", {"file": file_name}))
+
+	def test_chunked_pdf(self):
+		columns, data = execute({"project_title": TEST_TEMPLATE, "dimension": "All Indicators"})[:2]
+		frappe.local.conf.report_pdf_chunk_rows = 1
+		try:
+			with patch("frappe.utils.pdf.get_pdf", side_effect=make_blank_pdf) as get_pdf:
+				pdf = report_pdf.get_report_pdf("Survey Report", columns, data, "data:image/png;base64,AAAA")
+		finally:
+			frappe.local.conf.report_pdf_chunk_rows = 0
+
+		self.assertEqual(len(PdfReader(io.BytesIO(pdf)).pages), len(data))
+		documents = [call.args[0] for call in get_pdf.call_args_list]
+		# Only the first chunk has the title and the chart, every chunk has the column headers
+		self.assertEqual(sum('class="report-title"' in html for html in documents), 1)
+		self.assertTrue(all("<th>" in html for html in documents))
+		self.assertEqual(sum(html.count("<tr>") - 1 for html in documents), len(data))
+
+	def test_chart_svgs(self):
+		filters = {"project_title": TEST_TEMPLATE, "dimension": "All Indicators"}
+		chart = execute(filters)[3]
+		# Two indicators make no radar, only the bars
+		(bars,) = get_chart_svgs(filters, chart, "<Survey Report>")
+		self.assertTrue(bars.startswith("<svg"))
+		self.assertIn("&lt;Survey Report&gt;", bars)
+		self.assertIn("Rain Fall", bars)
+
+		# Cached until the data changes
+		with patch(
+			"gisappv1.gisappv1.report.survey_report.survey_report_chart.render_charts", return_value=[]
+		) as render_mock:
+			self.assertEqual(get_chart_svgs(filters, chart, "<Survey Report>"), [bars])
+			render_mock.assert_not_called()
+
+			survey = make_test_survey({"Rain Fall": (5, 5)})
+			self.addCleanup(survey.delete)
+			get_chart_svgs(filters, chart, "<Survey Report>")
+			render_mock.assert_called_once()
+
+		radar_chart = {
+			"data": {
+				"labels": ["A", "B", "C", "Average"],
+				"datasets": [{"name": name, "values": [1, 2, 3, 0]} for name in ("Variable 1", "Variable 2", "Average")],
+			}
+		}
+		radar, _bars = render_charts(radar_chart, "Radar")
+		self.assertEqual(radar.count("<polygon"), 5 + 3)
+
+		# Large values get a handful of round gridlines, not one per unit
+		self.assertEqual(get_ticks(5), (5, [1, 2, 3, 4, 5]))
+		self.assertEqual(get_ticks(37), (40, [10, 20, 30, 40]))
+		radar_chart["data"]["datasets"][0]["values"] = [1, 2, 1_000_000, 0]
+		radar, bars = render_charts(radar_chart, "Radar")
+		self.assertEqual(radar.count("<polygon"), 5 + 3)
+		self.assertEqual(bars.count("<line"), 6)
+
+	def test_spreadsheet_download(self):
+		filters = {"project_title": TEST_TEMPLATE, "dimension": "All Indicators"}
+		columns, data = execute(frappe._dict(filters))[:2]
+		fieldnames = [column["fieldname"] for column in columns]
+
+		header, *rows = list(iter_pivot_rows(frappe._dict(filters)))
+		self.assertEqual(header, ["Survey"] + [column["label"] for column in columns])
+		self.assertEqual(len(rows), len(data))
+		for row, report_row in zip(rows, data):
+			self.assertEqual(row[1:], [report_row.get(fieldname) for fieldname in fieldnames])
+		self.assertEqual([row[0] for row in rows[:2]], [row["parent"] for row in data[:2]])
+
+		response = download_csv(frappe.as_json(filters))
+		self.assertIn("attachment", response.headers["Content-Disposition"])
+		content = b"".join(response.response).decode()
+		response.response.close()
+		self.assertEqual(len(list(csv.reader(io.StringIO(content)))), len(data) + 1)
+
+	def test_bulk_pdf_export(self):
+		filters = {"project_title": TEST_TEMPLATE, "dimension": "Soil"}
+		with patch("frappe.enqueue") as enqueue:
+			enqueue_bulk_pdf_export(templates=[TEST_TEMPLATE, "_Test Missing Template"], filters=filters)
+		job = enqueue.call_args.kwargs
+
+		# The dimension was picked for the selected template only
+		self.assertEqual(get_template_filters(TEST_TEMPLATE, job["filters"])["dimension"], "Soil")
+		self.assertEqual(get_template_filters("_Test Missing Template", job["filters"])["dimension"], "All Indicators")
+
+		with patch("frappe.get_list", return_value=[]), self.assertRaises(frappe.ValidationError):
+			enqueue_bulk_pdf_export()
+
+		with (
+			patch.dict(frappe.conf, {"survey_report_bulk_pdf_workers": 1}),
+			patch("frappe.utils.pdf.get_pdf", side_effect=fail_missing_template),
+			patch("frappe.publish_realtime") as publish_realtime,
+			patch.object(frappe.db, "commit"),
+		):
+			file_name = run_bulk_pdf_job(job["templates"], job["filters"], job["bulk_job_id"], job["user"])
+
+		events = [call.args[1] for call in publish_realtime.call_args_list if call.args[0] == BULK_PDF_EVENT]
+		self.assertEqual([event.get("progress") for event in events], [50, 100, None])
+		self.assertTrue(events[-1]["done"])
+		self.assertEqual(events[-1]["file_name"], file_name)
+
+		# A template that fails is reported, the others are still exported
+		timings = {timing["template"]: timing for timing in events[-1]["timings"]}
+		self.assertTrue(timings[TEST_TEMPLATE]["file_name"])
+		self.assertIsNone(timings["_Test Missing Template"]["file_name"])
+
+		with zipfile.ZipFile(frappe.get_doc("File", file_name).get_full_path()) as archive:
+			self.assertEqual(archive.namelist(), [f"{TEST_TEMPLATE}.pdf"])
+
+	def test_pdf_file_download(self):
+		filters = {"project_title": TEST_TEMPLATE, "dimension": "All Indicators"}
+		with patch("frappe.utils.pdf.get_pdf", side_effect=make_blank_pdf):
+			file_name = export_to_pdf(filters, "Survey Report Download")
+		file_doc = frappe.get_doc("File", file_name)
+		self.addCleanup(setattr, frappe.local, "request", getattr(frappe.local, "request", None))
+
+		# Shared exports are known by name, not by what their file is called
+		self.assertTrue(can_download_export(file_name))
+		upload = frappe.get_doc(
+			{"doctype": "File", "file_name": "survey_report_upload.pdf", "content": b"%PDF-1.4", "is_private": 1}
+		).insert()
+		self.addCleanup(upload.delete)
+		self.assertFalse(can_download_export(upload.name))
+		self.assertNotIn(upload.name, delete_old_pdf_exports())
+
+		# Only the requested bytes are read from disk
+		set_request(method="GET", path="/api/method/get_pdf_file", headers={"Range": "bytes=0-4"})
+		response = get_pdf_file(file_name)
+		self.assertEqual(response.status_code, 206)
+		self.assertEqual(b"".join(response.response), b"%PDF-")
+		self.assertEqual(response.headers["Content-Range"], f"bytes 0-4/{file_doc.file_size}")
+		response.close()
+
+		set_request(method="GET", path="/api/method/get_pdf_file", headers={"X-Use-X-Accel-Redirect": "True"})
+		response = get_pdf_file(file_name)
+		self.assertEqual(response.headers["X-Accel-Redirect"], "/protected" + file_doc.file_url)
+		self.assertFalse(response.get_data())
+
+		# The download name is quoted, whatever it holds
+		frappe.db.set_value("File", file_name, "file_name", 'Survey "Report"; é.pdf')
+		response = get_pdf_file(file_name)
+		_value, options = parse_options_header(response.headers["Content-Disposition"])
+		self.assertEqual(options["filename"], 'Survey "Report"; é.pdf')
+		self.assertRegex(get_pdf_file_name('Survey "Report"\r\n', "0" * 16), r"^[\w-]+\.pdf$")
+
+		# Shared downloads are granted from the export records, not from the cache
+		frappe.clear_cache()
+		self.assertTrue(can_download_export(file_name))
@@ -85,6 +85,11 @@ app_license = "mit"
 # before_install = "gisappv1.install.before_install"
 # after_install = "gisappv1.install.after_install"
 
+# Migration
+# ------------
+
+after_migrate = "gisappv1.indexes.add_report_indexes"
+
 # Uninstallation
 # ------------
 
@@ -137,39 +142,44 @@ app_license = "mit"
 # ---------------
 # Hook on document methods and events
 
-# doc_events = {
-# 	"*": {
-# 		"on_update": "method",
-# 		"on_cancel": "method",
-# 		"on_trash": "method"
-# 	}
-# }
+doc_events = {
+	"Research Survey": {
+		"on_update": [
+			"gisappv1.gisappv1.doctype.survey_indicator_rollup.survey_indicator_rollup.on_survey_update",
+			"gisappv1.gisappv1.report.survey_report.survey_report_cache.invalidate_for_survey",
+			"gisappv1.gisappv1.report.ground_water_report.ground_water_report.clear_column_cache",
+		],
+		"on_trash": [
+			"gisappv1.gisappv1.doctype.survey_indicator_rollup.survey_indicator_rollup.on_survey_trash",
+			"gisappv1.gisappv1.report.survey_report.survey_report_cache.invalidate_for_survey",
+			"gisappv1.gisappv1.report.ground_water_report.ground_water_report.clear_column_cache",
+		],
+	},
+	"Research Template": {
+		"on_update": "gisappv1.gisappv1.report.survey_report.survey_report_cache.invalidate_for_template",
+		"on_trash": "gisappv1.gisappv1.report.survey_report.survey_report_cache.invalidate_for_template",
+		"after_rename": [
+			"gisappv1.gisappv1.doctype.survey_indicator_rollup.survey_indicator_rollup.on_template_rename",
+			"gisappv1.gisappv1.report.survey_report.survey_report_cache.invalidate_for_template",
+			"gisappv1.gisappv1.report.ground_water_report.ground_water_report.clear_column_cache",
+		],
+	},
+}
 
 # Scheduled Tasks
 # ---------------
 
-# scheduler_events = {
-# 	"all": [
-# 		"gisappv1.tasks.all"
-# 	],
-# 	"daily": [
-# 		"gisappv1.tasks.daily"
-# 	],
-# 	"hourly": [
-# 		"gisappv1.tasks.hourly"
-# 	],
-# 	"weekly": [
-# 		"gisappv1.tasks.weekly"
-# 	],
-# 	"monthly": [
-# 		"gisappv1.tasks.monthly"
-# 	],
-# }
+scheduler_events = {
+	"hourly": [
+		"gisappv1.tasks.delete_old_report_pdfs",
+	],
+}
 
 # Testing
 # -------
 
-# before_tests = "gisappv1.install.before_tests"
+# The indexes are DDL, which commits implicitly, so they are created before the test transactions start
+before_tests = "gisappv1.indexes.add_report_indexes"
 
 # Overriding Methods
 # ------------------------------
@@ -238,7 +248,7 @@ app_license = "mit"
 # Automatically update python controller files with type annotations for this app.
 # export_python_type_annotations = True
 
-# default_log_clearing_doctypes = {
-# 	"Logging DocType Name": 30  # days to retain logs
-# }
+default_log_clearing_doctypes = {
+	"Report Execution Log": 30  # days to retain logs
+}
 
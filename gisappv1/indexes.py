@@ -0,0 +1,72 @@
+import frappe
+
+# (doctype, fields, index name) of the indexes the report queries rely on
+REPORT_INDEXES = (
+	# Survey rows of a template, optionally narrowed to one dimension
+	("Data Entry Table", ["parent", "dimension", "indicator"], "parent_dimension_indicator_index"),
+	# DISTINCT indicator over all survey responses, read from the index alone
+	("Data Entry Table", ["parenttype", "indicator"], "parenttype_indicator_index"),
+	("Research Survey", ["project_title"], "project_title_index"),
+	# Ground Water Report surveys of a template within a creation date range
+	("Research Survey", ["project_title", "creation"], "project_title_creation_index"),
+)
+
+
+def add_report_indexes():
+	"""Create the REPORT_INDEXES that do not exist yet, runs after every migrate and before the tests."""
+	for doctype, fields, index_name in REPORT_INDEXES:
+		frappe.db.add_index(doctype, fields, index_name)
+
+
+def capture_report_queries(research_template):
+	"""
+	SELECT statements the reports run for a template, with their values
+
+	The reports are executed with `frappe.db.sql` wrapped, so the queries
+	are exactly the ones that run in production. Repeated statements (e.g.
+	one per survey) are only returned once.
+	"""
+	from gisappv1.gisappv1.doctype.research_template.template_metadata import (
+		get_dimension_options,
+		get_template_meta,
+	)
+	from gisappv1.gisappv1.report.ground_water_report import ground_water_report
+	from gisappv1.gisappv1.report.survey_report import survey_report
+
+	queries = {}
+	original_sql = frappe.db.sql
+
+	def capturing_sql(query, values=(), *args, **kwargs):
+		text = " ".join(str(query).split())
+		if text.upper().startswith("SELECT"):
+			queries.setdefault(text, values)
+		return original_sql(query, values, *args, **kwargs)
+
+	frappe.db.sql = capturing_sql
+	try:
+		for dimension in get_dimension_options(get_template_meta(research_template))[:2]:
+			# Bypass the result cache, a hit runs no queries
+			survey_report.get_report_result({"project_title": research_template, "dimension": dimension})
+			survey_report.get_report_result(
+				{"project_title": research_template, "dimension": dimension, "page_length": 100}
+			)
+		# Drop the cached indicators so the catalog query runs as well
+		ground_water_report.clear_column_cache()
+		ground_water_report.execute({"project_title": research_template})
+	finally:
+		frappe.db.sql = original_sql
+
+	return list(queries.items())
+
+
+def explain_report_queries(research_template):
+	"""
+	EXPLAIN plans of the report queries of a template
+
+	Returns:
+		list: (query, plan rows) for every distinct report query
+	"""
+	return [
+		(query, frappe.db.sql(f"EXPLAIN {query}", values, as_dict=True))
+		for query, values in capture_report_queries(research_template)
+	]
@@ -0,0 +1,5 @@
+from gisappv1.indexes import add_report_indexes
+
+
+def execute():
+	add_report_indexes()
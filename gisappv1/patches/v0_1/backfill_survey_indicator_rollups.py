@@ -0,0 +1,5 @@
+from gisappv1.gisappv1.doctype.survey_indicator_rollup.survey_indicator_rollup import rebuild_rollups
+
+
+def execute():
+	rebuild_rollups()
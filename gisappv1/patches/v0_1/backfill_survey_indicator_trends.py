@@ -0,0 +1,6 @@
+from gisappv1.gisappv1.doctype.survey_indicator_rollup.survey_indicator_rollup import rebuild_rollups
+
+
+def execute():
+	# Rebuilding the rollups fills the monthly trends as well
+	rebuild_rollups()
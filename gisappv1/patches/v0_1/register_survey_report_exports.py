@@ -0,0 +1,19 @@
+import frappe
+
+from gisappv1.gisappv1.report.survey_report.survey_report_export import register_export_file
+
+
+def execute():
+	# The exports used to be known only from two cache hashes, record the ones still there
+	exports = frappe.cache().hgetall("survey_report_export_files") or {}
+	scopes = {
+		entry["file"]: (scope, entry["key"])
+		for scope, entry in (frappe.cache().hgetall("survey_report_pdf_files") or {}).items()
+	}
+	for file_name, entry in exports.items():
+		if frappe.db.exists("File", file_name) and not frappe.db.exists(
+			"Survey Report Export", {"file": file_name}
+		):
+			register_export_file(file_name, entry["template"], *scopes.get(file_name, (None, None)))
+
+	frappe.cache().delete_value(["survey_report_export_files", "survey_report_pdf_files"])
@@ -0,0 +1,149 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import frappe
+
+
+class Phase:
+	"""Measurements of one phase, callers may set `rows` while it runs."""
+
+	def __init__(self, name):
+		self.name = name
+		self.rows = 0
+		self.wall_time_ms = 0.0
+		self.query_count = 0
+		self.peak_memory_kb = 0.0
+
+
+class ReportProfile:
+	"""
+	Wall time, row count, query count and peak memory of the phases of one report run
+
+	Queries are counted by wrapping `frappe.db.sql` while the profile is
+	active, memory is traced with tracemalloc.
+	"""
+
+	def __init__(self, report_name, filters=None):
+		self.report_name = report_name
+		self.filters = filters
+		self.run_id = frappe.generate_hash(length=12)
+		self.phases = []
+		self.stack = []
+		self.query_count = 0
+
+	def start(self):
+		self.started_tracing = not tracemalloc.is_tracing()
+		if self.started_tracing:
+			tracemalloc.start()
+		tracemalloc.reset_peak()
+
+		self.original_sql = frappe.db.sql
+
+		def counting_sql(*args, **kwargs):
+			self.query_count += 1
+			return self.original_sql(*args, **kwargs)
+
+		frappe.db.sql = counting_sql
+		self.total = Phase("total")
+		self.total_start = time.perf_counter()
+
+	def stop(self):
+		self.total.wall_time_ms = (time.perf_counter() - self.total_start) * 1000
+		self.total.query_count = self.query_count
+		self.total.peak_memory_kb = max(
+			[tracemalloc.get_traced_memory()[1] / 1024] + [phase.peak_memory_kb for phase in self.phases]
+		)
+		self.total.rows = max([phase.rows for phase in self.phases] or [0])
+
+		frappe.db.sql = self.original_sql
+		if self.started_tracing:
+			tracemalloc.stop()
+
+	@contextmanager
+	def phase(self, name):
+		record = Phase(name)
+		parent = self.stack[-1] if self.stack else None
+
+		# The peak is reset for every phase, hand what was reached so far to the enclosing one
+		if parent:
+			parent.peak_memory_kb = max(parent.peak_memory_kb, tracemalloc.get_traced_memory()[1] / 1024)
+		tracemalloc.reset_peak()
+
+		self.stack.append(record)
+		queries = self.query_count
+		start = time.perf_counter()
+		try:
+			yield record
+		finally:
+			record.wall_time_ms = (time.perf_counter() - start) * 1000
+			record.query_count = self.query_count - queries
+			record.peak_memory_kb = max(record.peak_memory_kb, tracemalloc.get_traced_memory()[1] / 1024)
+			self.stack.pop()
+			if parent:
+				parent.peak_memory_kb = max(parent.peak_memory_kb, record.peak_memory_kb)
+			self.phases.append(record)
+
+	def save(self):
+		filters = json.dumps(self.filters, default=str) if self.filters else None
+		for record in self.phases + [self.total]:
+			frappe.get_doc(
+				{
+					"doctype": "Report Execution Log",
+					"report_name": self.report_name,
+					"run_id": self.run_id,
+					"phase": record.name,
+					"wall_time_ms": record.wall_time_ms,
+					"row_count": record.rows,
+					"query_count": record.query_count,
+					"peak_memory_kb": record.peak_memory_kb,
+					"filters": filters,
+				}
+			).db_insert()
+
+
+def is_profiling_enabled():
+	return bool(frappe.conf.get("report_profiling"))
+
+
+def get_active_profile():
+	return getattr(frappe.local, "report_profile", None)
+
+
+@contextmanager
+def report_profile(report_name, filters=None):
+	"""
+	Profile one report run when `report_profiling` is set in the site config
+
+	Phases recorded inside are saved to Report Execution Log. A run started
+	inside another one (e.g. execute within export_to_pdf) joins the outer run.
+	"""
+	if not is_profiling_enabled() or get_active_profile():
+		yield get_active_profile()
+		return
+
+	profile = ReportProfile(report_name, filters)
+	frappe.local.report_profile = profile
+	profile.start()
+	try:
+		yield profile
+	finally:
+		profile.stop()
+		frappe.local.report_profile = None
+		try:
+			profile.save()
+		except Exception:
+			frappe.log_error("Report profile could not be saved", reference_doctype="Report Execution Log")
+
+
+@contextmanager
+def phase(name):
+	"""Record a phase of the active report profile, a no-op when nothing is being profiled."""
+	profile = get_active_profile()
+	if not profile:
+		yield Phase(name)
+		return
+
+	with profile.phase(name) as record:
+		yield record
@@ -0,0 +1,167 @@
+import contextvars
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+
+import frappe
+from frappe.utils import cint
+from jinja2 import Environment, FileSystemLoader
+from markupsafe import Markup, escape
+
+TEMPLATE = "report_pdf.html"
+
+# Landscape A4 the report tables fit on
+PDF_OPTIONS = {
+	"orientation": "Landscape",
+	"page-size": "A4",
+	"margin-top": "10mm",
+	"margin-right": "10mm",
+	"margin-bottom": "10mm",
+	"margin-left": "10mm",
+	"print-media-type": True,
+	"dpi": 300,
+}
+
+FLOAT_FIELDTYPES = ("Float", "Currency", "Percent")
+
+# Rows per wkhtmltopdf run when long tables are rendered in chunks
+DEFAULT_CHUNK_ROWS = 500
+
+
+@lru_cache(maxsize=None)
+def get_template():
+	"""The report PDF template, compiled once per process and with every value HTML escaped."""
+	environment = Environment(
+		loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), "templates")),
+		autoescape=True,
+		trim_blocks=True,
+		lstrip_blocks=True,
+	)
+	return environment.get_template(TEMPLATE)
+
+
+def format_float(value):
+	if isinstance(value, float):
+		# Digits only, nothing to escape
+		return "{:.2f}".format(value)
+	return escape(value)
+
+
+def get_visible_columns(columns):
+	# parent* columns only link the rows to their surveys, leaving them out keeps the table narrow
+	return [column for column in columns if not column.get("fieldname", "").startswith("parent")]
+
+
+def get_formatter(column):
+	"""Cell formatter of a column, picked once for the whole table: floats get two decimals, the rest is escaped."""
+	if column.get("fieldtype") in FLOAT_FIELDTYPES:
+		return format_float
+	return escape
+
+
+def iter_rows(data, columns):
+	"""Yield the escaped <tr> of every row, with the cells in the order of `columns`."""
+	fields = [(column.get("fieldname", ""), get_formatter(column)) for column in columns]
+	for row in data:
+		cells = "</td><td>".join([formatter(row.get(fieldname, "")) for fieldname, formatter in fields])
+		yield Markup(f"<tr><td>{cells}</td></tr>")
+
+
+def generate(report_name, columns, data, chart_image=None, show_header=True, charts=None):
+	"""
+	Stream the HTML of a report PDF, chunk by chunk
+
+	Args:
+		report_name (str): Title of the document
+		columns (list): Report columns, parent* columns are left out
+		data (list): Report rows
+		chart_image (str): Base64 encoded PNG of the chart, with or without its data: prefix
+		show_header (bool): Title, chart and table heading before the table, which always has its column headers
+		charts (list): <svg> Markup of the charts, shown instead of `chart_image`
+
+	Returns:
+		iterator: HTML chunks, rows are rendered as they are consumed
+	"""
+	if chart_image and "base64," in chart_image:
+		chart_image = chart_image.split("base64,")[1]
+
+	columns = get_visible_columns(columns)
+	return get_template().generate(
+		report_name=report_name,
+		generated_on=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+		chart_image=chart_image,
+		show_header=show_header,
+		charts=charts or [],
+		labels=[column.get("label", "") for column in columns],
+		rows=iter_rows(data, columns),
+	)
+
+
+def render(report_name, columns, data, chart_image=None, show_header=True, charts=None):
+	"""The HTML of a report PDF, see `generate`."""
+	return "".join(generate(report_name, columns, data, chart_image, show_header, charts))
+
+
+def iter_chunks(report_name, columns, data, chart_image=None, chunk_rows=DEFAULT_CHUNK_ROWS, charts=None):
+	"""HTML documents of consecutive ranges of `chunk_rows` rows, the first one with the title and the chart."""
+	for start in range(0, max(len(data), 1), chunk_rows):
+		yield render(
+			report_name, columns, data[start : start + chunk_rows], chart_image, show_header=not start, charts=charts
+		)
+
+
+def get_report_pdf(report_name, columns, data, chart_image=None, options=None, charts=None):
+	"""
+	Render a report to PDF, long tables in parallel chunks
+
+	Tables longer than `report_pdf_chunk_rows` (site config) are split into
+	row ranges that are rendered by concurrent wkhtmltopdf processes and
+	merged in order, so the title and chart page comes first.
+
+	Args:
+		report_name (str): Title of the document
+		columns (list): Report columns
+		data (list): Report rows
+		chart_image (str): Base64 encoded PNG of the chart
+		options (dict): wkhtmltopdf options, PDF_OPTIONS by default
+		charts (list): <svg> Markup of the charts, shown instead of `chart_image`
+
+	Returns:
+		bytes: The PDF
+	"""
+	from frappe.utils.pdf import get_pdf
+
+	options = options or PDF_OPTIONS
+	chunk_rows = cint(frappe.conf.get("report_pdf_chunk_rows")) or DEFAULT_CHUNK_ROWS
+	if len(data) <= chunk_rows:
+		return get_pdf(render(report_name, columns, data, chart_image, charts=charts), options=options)
+
+	chunks = list(iter_chunks(report_name, columns, data, chart_image, chunk_rows, charts))
+	workers = min(len(chunks), cint(frappe.conf.get("report_pdf_workers")) or os.cpu_count() or 1)
+
+	# wkhtmltopdf is a separate process, threads only wait for it. Each one
+	# runs in a copy of this context so frappe.local still points to the site.
+	with ThreadPoolExecutor(max_workers=workers) as executor:
+		parts = [
+			executor.submit(contextvars.copy_context().run, get_pdf, html, options=options) for html in chunks
+		]
+		return merge_pdfs([part.result() for part in parts])
+
+
+def merge_pdfs(parts):
+	"""One PDF of the pages of every part, in order."""
+	from pypdf import PdfReader, PdfWriter
+
+	writer = PdfWriter()
+	for part in parts:
+		writer.append(PdfReader(io.BytesIO(part)))
+
+	output = io.BytesIO()
+	writer.write(output)
+	return output.getvalue()
+
+
+def get_pdf_file_name(report_name):
+	return "{0}_{1}.pdf".format(report_name.replace(" ", "_").lower(), datetime.now().strftime("%Y%m%d_%H%M%S"))
@@ -0,0 +1,5 @@
+def delete_old_report_pdfs():
+	"""Apply the PDF export retention, see survey_report_export.delete_old_pdf_exports."""
+	from gisappv1.gisappv1.report.survey_report.survey_report_export import delete_old_pdf_exports
+
+	delete_old_pdf_exports()